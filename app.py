@@ -1,24 +1,15 @@
-import pandas as pd
 import streamlit as st
 import os
-import json
-import zipfile
-import io
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Import only the functions you need (avoid star imports)
 from source import (
+    CHECKLIST_ITEM_RE,
     load_sample_use_cases,
     load_control_templates,
-    select_use_case,
-    generate_sector_playbook,
-    generate_validation_checklist,
-    generate_monitoring_kpis,
-    generate_incident_triggers,
-    create_config_snapshot,
-    create_executive_summary,
-    generate_evidence_manifest,
-    generate_all_artifacts,
+    generate_playbook_components,
+    package_artifacts,
+    templates_digest,
 )
 
 # --- Streamlit Page Configuration ---
@@ -32,50 +23,95 @@ st.title("QuLab: Lab 13: Sector Playbook Builder (Healthcare & Finance)")
 st.divider()
 
 # --- Session State Initialization ---
-if "current_page" not in st.session_state:
-    st.session_state.current_page = "Sector & Use-Case Wizard"
-if "persona" not in st.session_state:
-    st.session_state.persona = "AI Risk Lead (Evelyn Reed)"
-if "data_loaded" not in st.session_state:
-    st.session_state.data_loaded = False
-if "all_use_cases" not in st.session_state:
-    st.session_state.all_use_cases = []
-if "selected_use_case_display" not in st.session_state:
-    st.session_state.selected_use_case_display = None
-if "selected_use_case" not in st.session_state:
-    st.session_state.selected_use_case = None
-if "current_sector" not in st.session_state:
-    st.session_state.current_sector = None
-if "current_system_type" not in st.session_state:
-    st.session_state.current_system_type = None
-if "current_risk_tier" not in st.session_state:
-    st.session_state.current_risk_tier = None
-if "current_sector_templates" not in st.session_state:
-    st.session_state.current_sector_templates = None
-if "playbook_components_generated" not in st.session_state:
-    st.session_state.playbook_components_generated = False
-if "ai_playbook" not in st.session_state:
-    st.session_state.ai_playbook = None
-if "validation_checklist_content" not in st.session_state:
-    st.session_state.validation_checklist_content = None
-if "monitoring_kpis" not in st.session_state:
-    st.session_state.monitoring_kpis = None
-if "incident_triggers" not in st.session_state:
-    st.session_state.incident_triggers = None
-if "final_artifacts_generated" not in st.session_state:
-    st.session_state.final_artifacts_generated = False
-if "config_snapshot" not in st.session_state:
-    st.session_state.config_snapshot = None
-if "executive_summary_content" not in st.session_state:
-    st.session_state.executive_summary_content = None
-if "evidence_manifest" not in st.session_state:
-    st.session_state.evidence_manifest = None
-if "output_dir_path" not in st.session_state:
-    st.session_state.output_dir_path = None
-if "output_zip_buffer" not in st.session_state:
-    st.session_state.output_zip_buffer = None
-if "output_zip_filename" not in st.session_state:
-    st.session_state.output_zip_filename = None
+# Generated outputs; restored together whenever the selected use case changes
+_GENERATED_DEFAULTS = {
+    "playbook_components_generated": False,
+    "ai_playbook": None,
+    "validation_checklist_content": None,
+    "monitoring_kpis": None,
+    "incident_triggers": None,
+    "final_artifacts_generated": False,
+    "config_snapshot": None,
+    "executive_summary_content": None,
+    "evidence_manifest": None,
+    "output_dir_path": None,
+    "output_zip_buffer": None,
+    "output_zip_filename": None,
+    "run_id": None,
+    "config_snapshot_display_ts": "—",
+    "evidence_manifest_display_ts": "—",
+}
+_DEFAULTS = {
+    "current_page": "Sector & Use-Case Wizard",
+    "persona": "AI Risk Lead (Evelyn Reed)",
+    "data_loaded": False,
+    "all_use_cases": [],
+    "use_case_options": {},
+    "use_case_keys": [],
+    "use_case_key_index": {},
+    "selected_use_case_display": None,
+    "selected_use_case": None,
+    "current_sector": None,
+    "current_system_type": None,
+    "current_risk_tier": None,
+    "current_sector_templates": None,
+    "current_templates_digest": None,
+    "persist_artifacts": True,
+    **_GENERATED_DEFAULTS,
+}
+for _key, _value in _DEFAULTS.items():
+    st.session_state.setdefault(_key, _value)
+
+# Streamlit drops elements a rerun does not re-emit, so chip CSS is tracked per run
+st.session_state._chips_css_injected = False
+
+
+# Below this total payload size, deflate costs more CPU than the bytes it saves
+_ZIP_STORED_MAX_BYTES = 1 << 20
+
+# Lists up to this length render as markdown; the dataframe grid has a heavy JS init cost
+_MARKDOWN_LIST_MAX_ROWS = 25
+
+# Chip styles; injected at most once per script run (see _chips)
+_CHIPS_CSS = """
+<style>
+  .chip-wrap { display:flex; flex-wrap:wrap; gap:8px; }
+  .chip {
+    display:inline-flex; align-items:center; padding:0 12px; height:var(--chip-height, 34px);
+    border-radius:999px; border:1px solid rgba(49,51,63,0.2);
+    background: rgba(49,51,63,0.04); font-size:0.95rem;
+  }
+</style>
+"""
+
+# Page 1 intro prose, sent as one markdown element per rerun instead of three
+_WIZARD_INTRO_MD = (
+    "## AI System Configuration & Control Explorer: Building a Sector-Specific AI Risk Playbook\n\n"
+    "Dr. Evelyn Reed, as the **{persona}** at Global Innovations Inc., faces the "
+    "critical challenge of ensuring that AI systems deployed across the company's diverse sectors meet stringent "
+    "regulatory and ethical standards. Each AI initiative presents a unique combination of sector-specific nuances, "
+    "technology types (Machine Learning, Large Language Models, AI Agents), and inherent risk levels.\n\n"
+    "This application simulates Evelyn's workflow in developing a 'Sector Playbook' for a proposed AI initiative. "
+    "She will dynamically configure AI risk requirements, observe how controls adapt, and generate comprehensive "
+    "documentation to justify tailored risk mitigations."
+)
+
+
+# --- Loaders ---
+# source.py caches the parsed data files per process, keyed on each file's mtime/size, and hands
+# back plain copies of the parsed data, so sessions cannot alter each other's use cases or templates.
+
+
+def _load_templates(sector: str, data_dir: str = "data"):
+    # The digest follows template edits, so it can key the generator cache below
+    templates = load_control_templates(sector, data_dir=data_dir)
+    return templates, templates_digest(templates)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_playbook_components(use_case: dict, digest: str, _templates: dict):
+    # Keyed on the use case + template content digest; the templates dict itself is not hashed
+    return generate_playbook_components(use_case=use_case, templates=_templates)
 
 
 # --- Callbacks ---
@@ -86,27 +122,26 @@ def _chips(items, chip_height_px: int = 34):
     if not items:
         st.info("No items available.")
         return
-    css = f"""
-    <style>
-      .chip-wrap {{ display:flex; flex-wrap:wrap; gap:8px; }}
-      .chip {{
-        display:inline-flex; align-items:center; padding:0 12px; height:{chip_height_px}px;
-        border-radius:999px; border:1px solid rgba(49,51,63,0.2);
-        background: rgba(49,51,63,0.04); font-size:0.95rem;
-      }}
-    </style>
-    """
-    st.markdown(css, unsafe_allow_html=True)
-    html = '<div class="chip-wrap">' + \
-        "".join(
-            [f'<div class="chip">{str(x)}</div>' for x in items]) + "</div>"
-    # Fallback if Streamlit internals change: don't rely on _escape_markdown
-    html = '<div class="chip-wrap">' + \
-        "".join(
-            [f'<div class="chip">{str(x)}</div>' for x in items]) + "</div>"
+    if not st.session_state._chips_css_injected:
+        st.markdown(_CHIPS_CSS, unsafe_allow_html=True)
+        st.session_state._chips_css_injected = True
+    # Build raw HTML ourselves: don't rely on Streamlit's _escape_markdown internals
+    html = f'<div class="chip-wrap" style="--chip-height:{chip_height_px}px">' + \
+        "".join(f'<div class="chip">{x}</div>' for x in items) + "</div>"
     st.markdown(html, unsafe_allow_html=True)
 
 
+def _item_list(items, column: str):
+    """Render short lists as markdown bullets; fall back to a dataframe grid for long ones."""
+    if len(items) <= _MARKDOWN_LIST_MAX_ROWS:
+        st.markdown("\n".join(f"- {x}" for x in items))
+    else:
+        import pandas as pd
+
+        st.dataframe(pd.DataFrame({column: items}),
+                     use_container_width=True, hide_index=True)
+
+
 def render_use_case_dashboard(use_case: dict):
     st.subheader("Use Case Overview")
     c1, c2, c3, c4 = st.columns(4)
@@ -137,17 +172,15 @@ def render_playbook_dashboard(playbook: dict):
 
 
 def render_validation_dashboard(validation_md: str):
+    import pandas as pd  # deferred: only pages with tables pay the import
+
     st.subheader("Validation Checklist")
     # Pull checklist items (lines starting with "- [ ]")
-    items = []
-    for ln in (validation_md or "").splitlines():
-        ln = ln.strip()
-        if ln.startswith("- [ ] "):
-            items.append({"Validation Item": ln.replace("- [ ] ", "").strip()})
+    items = CHECKLIST_ITEM_RE.findall(validation_md or "")
 
     if items:
         st.markdown("**Checklist Items**")
-        df = pd.DataFrame(items)
+        df = pd.DataFrame({"Validation Item": items})
         st.dataframe(df, use_container_width=True, hide_index=True)
         st.caption(f"{len(df)} validation activities")
     else:
@@ -157,33 +190,38 @@ def render_validation_dashboard(validation_md: str):
         st.markdown(validation_md or "")
 
 
-def render_monitoring_dashboard(kpis: list, triggers: list):
-    st.subheader("Monitoring & Incident Response")
-
-    c1, c2 = st.columns(2)
-    c1.metric("Monitoring KPIs", len(kpis or []))
-    c2.metric("Incident Triggers", len(triggers or []))
-
+def _kpi_trigger_columns(kpis, triggers, heading: str):
+    """Side-by-side KPI / trigger lists shared by the monitoring and snapshot dashboards."""
     left, right = st.columns(2)
 
     with left:
-        st.markdown("### Monitoring KPIs")
+        st.markdown(f"{heading} Monitoring KPIs")
         if kpis:
-            st.dataframe(pd.DataFrame({"KPI": kpis}),
-                         use_container_width=True, hide_index=True)
+            _item_list(kpis, "KPI")
         else:
             st.info("No KPIs available.")
 
     with right:
-        st.markdown("### Incident Triggers")
+        st.markdown(f"{heading} Incident Triggers")
         if triggers:
-            st.dataframe(pd.DataFrame({"Trigger": triggers}),
-                         use_container_width=True, hide_index=True)
+            _item_list(triggers, "Trigger")
         else:
             st.info("No incident triggers available.")
 
 
+def render_monitoring_dashboard(kpis: list, triggers: list):
+    st.subheader("Monitoring & Incident Response")
+
+    c1, c2 = st.columns(2)
+    c1.metric("Monitoring KPIs", len(kpis or []))
+    c2.metric("Incident Triggers", len(triggers or []))
+
+    _kpi_trigger_columns(kpis, triggers, heading="###")
+
+
 def render_snapshot_dashboard(snapshot: dict):
+    import pandas as pd
+
     st.subheader("Configuration Snapshot")
     use_case = snapshot.get("use_case_details", {}) if snapshot else {}
     playbook = snapshot.get("ai_playbook", {}) if snapshot else {}
@@ -192,8 +230,7 @@ def render_snapshot_dashboard(snapshot: dict):
     c1.metric("Sector", use_case.get("sector", "—"))
     c2.metric("Type", use_case.get("system_type", "—"))
     c3.metric("Risk", use_case.get("risk_tier", "—"))
-    c4.metric("Generated", (snapshot.get(
-        "generated_timestamp", "—")[:19] if snapshot else "—"))
+    c4.metric("Generated", st.session_state.config_snapshot_display_ts)
 
     st.markdown("**Controls (from playbook)**")
     _chips(playbook.get("controls", []))
@@ -220,84 +257,82 @@ def render_snapshot_dashboard(snapshot: dict):
 
     if monitoring_kpis or incident_triggers:
         st.markdown("**Monitoring & Incident Response**")
-        mkpis = pd.DataFrame({"KPI": monitoring_kpis}
-                             ) if monitoring_kpis else pd.DataFrame()
-        itriggers = pd.DataFrame(
-            {"Trigger": incident_triggers}) if incident_triggers else pd.DataFrame()
-
-        left, right = st.columns(2)
-
-        with left:
-            st.markdown("#### Monitoring KPIs")
-            if not mkpis.empty:
-                st.dataframe(mkpis, use_container_width=True, hide_index=True)
-            else:
-                st.info("No KPIs available.")
-
-        with right:
-            st.markdown("#### Incident Triggers")
-            if not itriggers.empty:
-                st.dataframe(itriggers, use_container_width=True,
-                             hide_index=True)
-            else:
-                st.info("No incident triggers available.")
+        _kpi_trigger_columns(monitoring_kpis, incident_triggers, heading="####")
 
 
 def render_evidence_manifest_dashboard(manifest: dict):
+    import pandas as pd
+
     st.subheader("Evidence Manifest (Auditability)")
     artifacts = (manifest or {}).get("artifacts", [])
-    ts = (manifest or {}).get("manifest_timestamp", "—")
 
     c1, c2 = st.columns(2)
     c1.metric("Artifacts Tracked", len(artifacts))
-    c2.metric("Manifest Timestamp", ts[:19] if isinstance(ts, str) else "—")
+    c2.metric("Manifest Timestamp", st.session_state.evidence_manifest_display_ts)
 
     if artifacts:
+        # In-memory exports record no filepath; the Path column only shows for saved artifacts
+        show_path = any(a.get("filepath") for a in artifacts)
         rows = []
         missing = 0
         for a in artifacts:
-            status = "OK" if "sha256_hash" in a else a.get("status", "UNKNOWN")
-            if status != "OK":
-                missing += 1
-            rows.append(
-                {
-                    "Filename": a.get("filename", ""),
-                    "Status": status,
-                    "SHA-256 (prefix)": (a.get("sha256_hash", "")[:16] + "…") if a.get("sha256_hash") else "",
-                    "Path": a.get("filepath", ""),
-                }
-            )
-        st.dataframe(pd.DataFrame(rows),
-                     use_container_width=True, hide_index=True)
+            h = a.get("sha256_hash")
+            status = "OK" if h else a.get("status", "UNKNOWN")
+            missing += status != "OK"
+            row = (a.get("filename", ""), status, (h[:16] + "…") if h else "")
+            rows.append(row + (a.get("filepath", ""),) if show_path else row)
+        columns = ["Filename", "Status", "SHA-256 (prefix)"]
+        st.dataframe(
+            pd.DataFrame.from_records(
+                rows, columns=columns + ["Path"] if show_path else columns),
+            use_container_width=True, hide_index=True)
         if missing:
             st.warning(f"{missing} artifact(s) missing.")
     else:
         st.info("No artifacts recorded in manifest.")
 
 
+@st.fragment
+def render_download_panel():
+    # Fragment: a download click reruns only this block, not the dashboards above
+    if st.session_state.output_zip_buffer and st.session_state.output_zip_filename:
+        st.download_button(
+            label="Download All Artifacts as ZIP",
+            # Deferred: bytes are copied out of the buffer only when the user clicks,
+            # not registered with the media file manager on every rerun
+            data=st.session_state.output_zip_buffer.getvalue,
+            file_name=st.session_state.output_zip_filename,
+            mime="application/zip",
+        )
+
+
+def _display_ts(ts) -> str:
+    """'YYYY-MM-DD HH:MM:SS UTC' for the UTC ISO timestamps source.py stamps on artifacts."""
+    if not isinstance(ts, str) or not ts:
+        return "—"
+    return ts[:19].replace("T", " ") + " UTC"
+
+
+def _sync_persist_preference():
+    st.session_state.persist_artifacts = st.session_state.persist_artifacts_checkbox
+
+
 def _reset_generated_state():
-    st.session_state.playbook_components_generated = False
-    st.session_state.final_artifacts_generated = False
-    st.session_state.ai_playbook = None
-    st.session_state.validation_checklist_content = None
-    st.session_state.monitoring_kpis = None
-    st.session_state.incident_triggers = None
-    st.session_state.config_snapshot = None
-    st.session_state.executive_summary_content = None
-    st.session_state.evidence_manifest = None
-    st.session_state.output_dir_path = None
-    st.session_state.output_zip_buffer = None
-    st.session_state.output_zip_filename = None
+    st.session_state.update(_GENERATED_DEFAULTS)
 
 
 def load_data_callback():
     # source.py ensures data files exist; just load
     st.session_state.all_use_cases = load_sample_use_cases(data_dir="data")
+    st.session_state.use_case_options = {
+        f"{uc['name']} ({uc['id']})": uc for uc in st.session_state.all_use_cases}
+    st.session_state.use_case_keys = list(st.session_state.use_case_options)
+    st.session_state.use_case_key_index = {
+        k: i for i, k in enumerate(st.session_state.use_case_keys)}
     st.session_state.data_loaded = True
 
-    if st.session_state.all_use_cases:
-        first = st.session_state.all_use_cases[0]
-        st.session_state.selected_use_case_display = f"{first['name']} ({first['id']})"
+    if st.session_state.use_case_keys:
+        st.session_state.selected_use_case_display = st.session_state.use_case_keys[0]
         update_selected_use_case()
 
     st.success("AI Control Templates and Use Cases Loaded!")
@@ -305,15 +340,12 @@ def load_data_callback():
 
 def update_selected_use_case():
     if st.session_state.selected_use_case_display and st.session_state.data_loaded:
-        use_case_options = {
-            f"{uc['name']} ({uc['id']})": uc["id"] for uc in st.session_state.all_use_cases}
-        selected_id = use_case_options[st.session_state.selected_use_case_display]
-
-        st.session_state.selected_use_case = select_use_case(
-            selected_id, st.session_state.all_use_cases)
+        # use_case_options maps each label straight to its use-case dict
+        st.session_state.selected_use_case = st.session_state.use_case_options.get(
+            st.session_state.selected_use_case_display)
 
         if not st.session_state.selected_use_case:
-            st.error(f"Use case with ID {selected_id} not found.")
+            st.error(f"Use case '{st.session_state.selected_use_case_display}' not found.")
             _reset_generated_state()
             return
 
@@ -323,10 +355,10 @@ def update_selected_use_case():
         st.session_state.current_risk_tier = st.session_state.selected_use_case["risk_tier"]
 
         # Load templates for sector
-        st.session_state.current_sector_templates = load_control_templates(
-            st.session_state.current_sector,
-            data_dir="data",
-        )
+        (
+            st.session_state.current_sector_templates,
+            st.session_state.current_templates_digest,
+        ) = _load_templates(st.session_state.current_sector, data_dir="data")
 
         _reset_generated_state()
 
@@ -336,30 +368,13 @@ def generate_playbook_components_callback():
     templates = st.session_state.current_sector_templates
 
     if use_case and templates:
-        st.session_state.ai_playbook = generate_sector_playbook(
-            sector=use_case["sector"],
-            system_type=use_case["system_type"],
-            risk_tier=use_case["risk_tier"],
-            templates=templates,
-        )
-
-        # NEW signature: generate_validation_checklist(use_case, templates)
-        st.session_state.validation_checklist_content = generate_validation_checklist(
-            use_case=use_case,
-            templates=templates,
-        )
-
-        # NEW signature: generate_monitoring_kpis(use_case, templates)
-        st.session_state.monitoring_kpis = generate_monitoring_kpis(
-            use_case=use_case,
-            templates=templates,
-        )
-
-        # NEW signature: generate_incident_triggers(use_case, templates)
-        st.session_state.incident_triggers = generate_incident_triggers(
-            use_case=use_case,
-            templates=templates,
-        )
+        (
+            st.session_state.ai_playbook,
+            st.session_state.validation_checklist_content,
+            st.session_state.monitoring_kpis,
+            st.session_state.incident_triggers,
+        ) = _cached_playbook_components(
+            use_case, st.session_state.current_templates_digest, templates)
 
         st.session_state.playbook_components_generated = True
         st.success("Playbook components generated!")
@@ -369,55 +384,80 @@ def generate_playbook_components_callback():
 
 def generate_final_artifacts_callback():
     """
-    Use the orchestration API in source.py so the export behavior stays consistent.
+    Use the packaging API in source.py so the export behavior stays consistent.
     We still keep in-memory state for rendering in Streamlit.
     """
     if not st.session_state.playbook_components_generated:
         st.error("Please generate playbook components first.")
         return
+    # The button is disabled once generated, but a queued double-click can still land here
+    if st.session_state.final_artifacts_generated:
+        return
+
+    import io
+    import zipfile  # deferred: only the export path needs these
 
-    run_id = datetime.now().strftime("Session_13_%Y%m%d_%H%M%S")
+    # Each st.session_state attribute read goes through SessionStateProxy; read once into locals
+    state = st.session_state
+    run_id = state.run_id
+    if run_id is None:
+        run_id = state.run_id = datetime.now(timezone.utc).strftime("Session_13_%Y%m%d_%H%M%SZ")
     output_base_dir = "reports/session13"
     output_dir = os.path.join(output_base_dir, run_id)
-    os.makedirs(output_dir, exist_ok=True)
+    persist = state.persist_artifacts
+    persona = state.persona
 
     # Determine AI Risk Lead name from persona (optional polish)
-    ai_risk_lead = "Dr. Evelyn Reed" if "Evelyn" in st.session_state.persona else st.session_state.persona
-
-    # Use source.py orchestrator to (1) write files, (2) compute manifest, (3) return in-memory objects
-    result = generate_all_artifacts(
-        use_case_id=st.session_state.selected_use_case["id"],
-        data_dir="data",
+    ai_risk_lead = "Dr. Evelyn Reed" if "Evelyn" in persona else persona
+
+    # Package the components already generated on page 1 (no reload/regeneration): source.py
+    # builds snapshot + summary, serializes each artifact once, optionally writes + hashes them
+    result = package_artifacts(
+        use_case=state.selected_use_case,
+        playbook=state.ai_playbook,
+        validation_md=state.validation_checklist_content,
+        kpis=state.monitoring_kpis,
+        triggers=state.incident_triggers,
         output_dir=output_dir,
         ai_risk_lead=ai_risk_lead,
-        write_files=True,
+        write_files=persist,
     )
 
-    # Populate Streamlit session state from result (for display)
-    st.session_state.output_dir_path = output_dir
-    st.session_state.ai_playbook = result.playbook
-    st.session_state.validation_checklist_content = result.validation_checklist_md
-    st.session_state.monitoring_kpis = result.monitoring_kpis
-    st.session_state.incident_triggers = result.incident_triggers
-    st.session_state.config_snapshot = result.config_snapshot
-    st.session_state.executive_summary_content = result.executive_summary_md
-    st.session_state.evidence_manifest = result.evidence_manifest
-
-    # Zip output directory
-    st.session_state.output_zip_buffer = io.BytesIO()
-    st.session_state.output_zip_filename = f"{run_id}.zip"
-
-    with zipfile.ZipFile(st.session_state.output_zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-        for root, _, files in os.walk(output_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, output_dir)
-                zf.write(file_path, arcname)
-
-    st.session_state.output_zip_buffer.seek(0)
+    # Zip the in-memory artifact table (no second pass over the output directory)
+    zip_buffer = io.BytesIO()
+    if sum(map(len, result.artifacts.values())) < _ZIP_STORED_MAX_BYTES:
+        zip_kwargs = {"compression": zipfile.ZIP_STORED}
+    else:
+        zip_kwargs = {"compression": zipfile.ZIP_DEFLATED, "compresslevel": 1}
+    with zipfile.ZipFile(zip_buffer, "w", **zip_kwargs) as zf:
+        for arcname, payload in result.artifacts.items():
+            zf.writestr(arcname, payload)
+    zip_buffer.seek(0)
+
+    # Timestamps are shown to the second; format once here rather than on every render
+    snapshot_ts = result.config_snapshot.get("generated_timestamp")
+    manifest_ts = result.evidence_manifest.get("manifest_timestamp")
+    # Populate Streamlit session state from result (for display) in one update
+    state.update(
+        output_dir_path=output_dir if persist else None,
+        ai_playbook=result.playbook,
+        validation_checklist_content=result.validation_checklist_md,
+        monitoring_kpis=result.monitoring_kpis,
+        incident_triggers=result.incident_triggers,
+        config_snapshot=result.config_snapshot,
+        executive_summary_content=result.executive_summary_md,
+        evidence_manifest=result.evidence_manifest,
+        config_snapshot_display_ts=_display_ts(snapshot_ts),
+        evidence_manifest_display_ts=_display_ts(manifest_ts),
+        output_zip_buffer=zip_buffer,
+        output_zip_filename=f"{run_id}.zip",
+    )
 
-    st.session_state.final_artifacts_generated = True
-    st.success(f"All artifacts generated and saved to '{output_dir}'!")
+    state.final_artifacts_generated = True
+    if persist:
+        st.success(f"All artifacts generated and saved to '{output_dir}'!")
+    else:
+        st.success("All artifacts generated in memory and packaged for download!")
 
 
 # --- Sidebar ---
@@ -437,19 +477,7 @@ st.session_state.persona = "AI Risk Lead (Evelyn Reed)"
 
 # --- Page 1: Sector & Use-Case Wizard ---
 if st.session_state.current_page == "Sector & Use-Case Wizard":
-    st.markdown(
-        "## AI System Configuration & Control Explorer: Building a Sector-Specific AI Risk Playbook")
-    st.markdown(
-        f"Dr. Evelyn Reed, as the **{st.session_state.persona.split(' ')[0]}** at Global Innovations Inc., faces the "
-        "critical challenge of ensuring that AI systems deployed across the company's diverse sectors meet stringent "
-        "regulatory and ethical standards. Each AI initiative presents a unique combination of sector-specific nuances, "
-        "technology types (Machine Learning, Large Language Models, AI Agents), and inherent risk levels."
-    )
-    st.markdown(
-        "This application simulates Evelyn's workflow in developing a 'Sector Playbook' for a proposed AI initiative. "
-        "She will dynamically configure AI risk requirements, observe how controls adapt, and generate comprehensive "
-        "documentation to justify tailored risk mitigations."
-    )
+    st.markdown(_WIZARD_INTRO_MD.format(persona=st.session_state.persona.split(' ')[0]))
 
     st.markdown("### Prepare Your Tools")
     st.button(
@@ -464,38 +492,32 @@ if st.session_state.current_page == "Sector & Use-Case Wizard":
         st.markdown("---")
         st.markdown("### Select AI Initiative")
 
-        use_case_options = {
-            f"{uc['name']} ({uc['id']})": uc["id"] for uc in st.session_state.all_use_cases}
+        use_case_keys = st.session_state.use_case_keys
 
-        if st.session_state.selected_use_case_display is None and use_case_options:
-            st.session_state.selected_use_case_display = list(
-                use_case_options.keys())[0]
+        if st.session_state.selected_use_case_display is None and use_case_keys:
+            st.session_state.selected_use_case_display = use_case_keys[0]
             update_selected_use_case()
 
-        current_index = 0
-        if st.session_state.selected_use_case_display in list(use_case_options.keys()):
-            current_index = list(use_case_options.keys()).index(
-                st.session_state.selected_use_case_display)
+        current_index = st.session_state.use_case_key_index.get(
+            st.session_state.selected_use_case_display, 0)
 
         st.selectbox(
             "Choose an AI Use Case",
-            options=list(use_case_options.keys()),
+            options=use_case_keys,
             index=current_index,
             key="selected_use_case_display",
             on_change=update_selected_use_case,
         )
 
         if st.session_state.selected_use_case:
+            use_case = st.session_state.selected_use_case
             st.markdown(
-                f"**Selected AI Initiative:** {st.session_state.selected_use_case['name']} "
-                f"(`{st.session_state.selected_use_case['id']}`)"
+                f"**Selected AI Initiative:** {use_case['name']} (`{use_case['id']}`)\n\n"
+                f"**Description:** {use_case['description']}\n\n"
+                f"**Sector:** {st.session_state.current_sector}\n\n"
+                f"**System Type:** {st.session_state.current_system_type}\n\n"
+                f"**Risk Tier:** {st.session_state.current_risk_tier}"
             )
-            st.markdown(
-                f"**Description:** {st.session_state.selected_use_case['description']}")
-            st.markdown(f"**Sector:** {st.session_state.current_sector}")
-            st.markdown(
-                f"**System Type:** {st.session_state.current_system_type}")
-            st.markdown(f"**Risk Tier:** {st.session_state.current_risk_tier}")
         else:
             st.warning("Please select a use case to proceed.")
 
@@ -547,6 +569,17 @@ elif st.session_state.current_page == "Monitoring KPI Designer":
 elif st.session_state.current_page == "Export Panel":
     st.markdown("## Generate & Export AI Risk Playbook Artifacts")
     if st.session_state.playbook_components_generated:
+        # The widget's own state is dropped whenever another page renders; the preference lives
+        # in the plain persist_artifacts key and seeds the widget each time it is shown
+        st.checkbox(
+            "Also save artifacts to disk",
+            value=st.session_state.persist_artifacts,
+            key="persist_artifacts_checkbox",
+            on_change=_sync_persist_preference,
+            disabled=st.session_state.final_artifacts_generated,
+            help="The ZIP download is always built in memory; this additionally writes the files "
+                 "(and a hashed evidence manifest) under reports/session13.",
+        )
         st.button(
             "Generate All Final Artifacts",
             key="generate_final_artifacts_button",
@@ -572,16 +605,11 @@ elif st.session_state.current_page == "Export Panel":
                 st.session_state.evidence_manifest)
 
             st.markdown("---")
-            st.markdown(
-                f"**Output Directory:** `{st.session_state.output_dir_path}`")
-
-            if st.session_state.output_zip_buffer and st.session_state.output_zip_filename:
-                st.download_button(
-                    label="Download All Artifacts as ZIP",
-                    data=st.session_state.output_zip_buffer.getvalue(),
-                    file_name=st.session_state.output_zip_filename,
-                    mime="application/zip",
-                )
+            if st.session_state.output_dir_path:
+                st.markdown(
+                    f"**Output Directory:** `{st.session_state.output_dir_path}`")
+
+            render_download_panel()
         else:
             st.info(
                 "Click 'Generate All Final Artifacts' to create the exportable documents.")
@@ -1,446 +1,715 @@
 # source.py
 from __future__ import annotations
 
+import functools
 import json
 import hashlib
+import mmap
 import os
+import re
+import sys
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import orjson  # optional: C-accelerated JSON encode/decode
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
 
 
 # -----------------------------
 # Defaults (synthetic templates)
 # -----------------------------
 
-def get_default_healthcare_control_templates() -> Dict[str, Any]:
-    return {
-        "ML": {
-            "Low": {
-                "controls": ["Data governance (Healthcare)", "Model documentation (Healthcare)"],
-                "validation": [
-                    "Basic performance metrics (accuracy, $P(\\text{correct}) > 0.8$)",
-                    "Data quality check ($missing\\_data < 5\\%$)",
-                ],
-                "monitoring": ["Model drift (basic)", "Prediction integrity"],
-                "incident_triggers": ["Significant performance drop (e.g., accuracy below $0.75$)"],
-            },
-            "Medium": {
-                "controls": [
-                    "Data governance (Healthcare)",
-                    "Model documentation (Healthcare)",
-                    "Bias detection (demographics)",
-                    "Robustness testing (Healthcare specific)",
-                ],
-                "validation": [
-                    "Advanced performance (AUC, F1, Sensitivity, Specificity)",
-                    "Bias fairness metrics (e.g., $FNR_{groupA} - FNR_{groupB} < 0.05$)",
-                    "Outlier detection",
-                ],
-                "monitoring": [
-                    "Model drift (detailed)",
-                    "Fairness metric drift",
-                    "Outcome drift (e.g., re-hospitalization rates)",
-                ],
-                "incident_triggers": [
-                    "Unacceptable bias detected",
-                    "Unexplained outcome changes",
-                    "High override rate ($>10\\%$ of predictions)",
-                ],
-            },
-            "High": {
-                "controls": [
-                    "Data governance (Healthcare)",
-                    "Model documentation (Healthcare)",
-                    "Bias detection (demographics)",
-                    "Robustness testing (Healthcare specific)",
-                    "Clinical override protocol",
-                    "Human-in-the-loop for critical decisions",
-                    "Explainability for clinicians",
-                    "Privacy-preserving data handling (HIPAA compliance)",
-                ],
-                "validation": [
-                    "Comprehensive performance (Sensitivity, Specificity, $FNR_{target\\_condition} < 0.01$)",
-                    "Bias fairness metrics (e.g., $FNR_{protected\\_group} - FNR_{overall} < 0.02$)",
-                    "Adversarial robustness (Healthcare-specific attacks)",
-                    "Causal inference checks (clinical outcomes)",
-                ],
-                "monitoring": [
-                    "Model drift (real-time)",
-                    "Fairness metric drift (critical groups)",
-                    "Outcome drift (real-time)",
-                    "Override rates (by clinician/type)",
-                    "Alert fatigue metrics (human feedback loop)",
-                ],
-                "incident_triggers": [
-                    "Critical FNR increase (e.g., $FNR > 0.015$)",
-                    "Sudden override rate surge ($>20\\%$ threshold)",
-                    "Adverse patient outcome correlation identified",
-                ],
-            },
+_DEFAULT_HEALTHCARE_TEMPLATES: Dict[str, Any] = {
+    "ML": {
+        "Low": {
+            "controls": ["Data governance (Healthcare)", "Model documentation (Healthcare)"],
+            "validation": [
+                "Basic performance metrics (accuracy, $P(\\text{correct}) > 0.8$)",
+                "Data quality check ($missing\\_data < 5\\%$)",
+            ],
+            "monitoring": ["Model drift (basic)", "Prediction integrity"],
+            "incident_triggers": ["Significant performance drop (e.g., accuracy below $0.75$)"],
         },
-        "LLM": {
-            "Low": {
-                "controls": ["Prompt engineering guidelines (Healthcare)", "Basic content moderation (Healthcare)"],
-                "validation": ["Fluency and coherence (medical context)", "Relevance check (patient queries)"],
-                "monitoring": ["Output quality (grammar, medical terminology)", "Query volume (trends)"],
-                "incident_triggers": ["Inappropriate content generation (medical ethics breach)"],
-            },
-            "Medium": {
-                "controls": [
-                    "Prompt engineering guidelines (Healthcare)",
-                    "Advanced content moderation (Healthcare)",
-                    "Fact-checking integration (medical literature)",
-                    "Data privacy controls (PHI)",
-                ],
-                "validation": [
-                    "Hallucination rate evaluation (medical facts, $P(\\text{hallucination}) < 0.05$)",
-                    "Bias in generated text (gender, ethnicity)",
-                    "Context adherence (patient history)",
-                ],
-                "monitoring": [
-                    "Hallucination rate drift",
-                    "Bias metric drift (text generation)",
-                    "Information accuracy (medical claims)",
-                ],
-                "incident_triggers": ["Increased hallucination (medical advice)", "Misinformation generation (patient safety risk)"],
-            },
-            "High": {
-                "controls": [
-                    "Prompt engineering guidelines (Healthcare)",
-                    "Advanced content moderation (Healthcare)",
-                    "Fact-checking integration (medical literature)",
-                    "Data privacy controls (PHI)",
-                    "Clinical verification workflow (human review for diagnoses)",
-                    "Privacy-preserving methods (e.g., K-anonymity)",
-                ],
-                "validation": [
-                    "Hallucination rate (strict thresholds, e.g., $P(\\text{hallucination}) < 0.005$ for diagnostic advice)",
-                    "Bias in generated text for sensitive groups",
-                    "Privacy leakage detection (PHI)",
-                    "Clinical relevance and safety (adherence to guidelines)",
-                ],
-                "monitoring": [
-                    "Hallucination rate drift (real-time, critical)",
-                    "Privacy violation alerts (real-time)",
-                    "Clinical override rates (for LLM suggestions)",
-                    "Adherence to medical guidelines (automated checks)",
-                ],
-                "incident_triggers": ["Medical misinformation leading to harm", "Patient data breach (PHI exposure)", "Unsafe clinical recommendations generated"],
-            },
+        "Medium": {
+            "controls": [
+                "Data governance (Healthcare)",
+                "Model documentation (Healthcare)",
+                "Bias detection (demographics)",
+                "Robustness testing (Healthcare specific)",
+            ],
+            "validation": [
+                "Advanced performance (AUC, F1, Sensitivity, Specificity)",
+                "Bias fairness metrics (e.g., $FNR_{groupA} - FNR_{groupB} < 0.05$)",
+                "Outlier detection",
+            ],
+            "monitoring": [
+                "Model drift (detailed)",
+                "Fairness metric drift",
+                "Outcome drift (e.g., re-hospitalization rates)",
+            ],
+            "incident_triggers": [
+                "Unacceptable bias detected",
+                "Unexplained outcome changes",
+                "High override rate ($>10\\%$ of predictions)",
+            ],
         },
-        "Agent": {
-            "Low": {
-                "controls": ["Action logging (Healthcare tasks)", "Basic authorization (Healthcare systems)"],
-                "validation": ["Action efficacy (e.g., appointment scheduling accuracy)", "Boundary adherence (role limits)"],
-                "monitoring": ["Action frequency", "Error rate (task completion)"],
-                "incident_triggers": ["Unauthorized action attempts"],
-            },
-            "Medium": {
-                "controls": [
-                    "Action logging (Healthcare tasks)",
-                    "Granular authorization (Healthcare systems)",
-                    "Reversibility protocols (patient actions)",
-                    "Autonomous action limits (e.g., dose adjustments)",
-                ],
-                "validation": [
-                    "Complex task success rate (e.g., patient pathway optimization)",
-                    "Unintended side effects (system interactions)",
-                    "Reversal capability (action undo)",
-                ],
-                "monitoring": ["Autonomous action limits breached", "Error cascades (system-wide)", "Human intervention rates (agent-triggered)"],
-                "incident_triggers": ["Agent taking unintended medical actions", "Significant error rate spike (impacting patient flow)"],
-            },
-            "High": {
-                "controls": [
-                    "Action logging (Healthcare tasks)",
-                    "Granular authorization (Healthcare systems)",
-                    "Reversibility protocols (patient actions)",
-                    "Autonomous action limits (e.g., drug delivery)",
-                    "Emergency stop mechanism (physical/digital)",
-                    "Comprehensive audit trails (clinical decisions)",
-                ],
-                "validation": [
-                    "Critical task success rate (e.g., $P(\\text{incorrect action}) < 0.001$ for life-critical functions)",
-                    "Catastrophic failure modes (simulations)",
-                    "Compliance with medical ethics and regulations (e.g., FDA)",
-                ],
-                "monitoring": [
-                    "Unauthorized action attempts",
-                    "Emergency stop activations",
-                    "Audit trail integrity (real-time checks)",
-                    "Deviation from pre-approved action space (e.g., off-label use)",
-                ],
-                "incident_triggers": ["Uncontrolled agent behavior (patient harm)", "Patient safety compromise (critical incident)", "System bypass attempts (security breach)"],
-            },
+        "High": {
+            "controls": [
+                "Data governance (Healthcare)",
+                "Model documentation (Healthcare)",
+                "Bias detection (demographics)",
+                "Robustness testing (Healthcare specific)",
+                "Clinical override protocol",
+                "Human-in-the-loop for critical decisions",
+                "Explainability for clinicians",
+                "Privacy-preserving data handling (HIPAA compliance)",
+            ],
+            "validation": [
+                "Comprehensive performance (Sensitivity, Specificity, $FNR_{target\\_condition} < 0.01$)",
+                "Bias fairness metrics (e.g., $FNR_{protected\\_group} - FNR_{overall} < 0.02$)",
+                "Adversarial robustness (Healthcare-specific attacks)",
+                "Causal inference checks (clinical outcomes)",
+            ],
+            "monitoring": [
+                "Model drift (real-time)",
+                "Fairness metric drift (critical groups)",
+                "Outcome drift (real-time)",
+                "Override rates (by clinician/type)",
+                "Alert fatigue metrics (human feedback loop)",
+            ],
+            "incident_triggers": [
+                "Critical FNR increase (e.g., $FNR > 0.015$)",
+                "Sudden override rate surge ($>20\\%$ threshold)",
+                "Adverse patient outcome correlation identified",
+            ],
         },
-    }
-
-
-def get_default_finance_control_templates() -> Dict[str, Any]:
-    return {
-        "ML": {
-            "Low": {
-                "controls": ["Data governance (Finance)", "Model documentation (Finance)"],
-                "validation": ["Basic performance metrics (accuracy, $P(\\text{correct}) > 0.85$)", "Input data validation (financial ranges)"],
-                "monitoring": ["Model drift", "Feature drift (economic indicators)"],
-                "incident_triggers": ["Significant performance drop (e.g., accuracy below $0.8$)"],
-            },
-            "Medium": {
-                "controls": [
-                    "Data governance (Finance)",
-                    "Model documentation (Finance)",
-                    "Bias & fairness analysis (credit scoring)",
-                    "Explainability (SHAP/LIME for loan officers)",
-                ],
-                "validation": [
-                    "Advanced performance (Precision, Recall, F1 for fraud)",
-                    "Bias fairness metrics (e.g., $0.8 \\le DIR \\le 1.25$ for protected groups in lending)",
-                    "Explainability report consistency",
-                ],
-                "monitoring": ["Model drift (detailed)", "Feature drift", "Bias metric drift (by demographic)", "Explainability consistency"],
-                "incident_triggers": ["Unfair outcomes for protected groups", "Inconsistent explanations leading to appeals"],
-            },
-            "High": {
-                "controls": [
-                    "Data governance (Finance)",
-                    "Model documentation (Finance)",
-                    "Bias & fairness analysis (credit scoring)",
-                    "Explainability (SHAP/LIME for loan officers)",
-                    "Auditability framework (SOX compliance)",
-                    "Adherence to regulatory guidelines (e.g., CCPA, GDPR)",
-                ],
-                "validation": [
-                    "Comprehensive performance (F1, AUROC, Precision@k for fraud, $FPR_{fraud} < 0.001$)",
-                    "Bias fairness metrics (e.g., $0.8 \\le DIR \\le 1.25$ for all protected groups in credit decisions)",
-                    "Robust explainability validation (counterfactuals)",
-                    "Adversarial attack resistance (financial data)",
-                ],
-                "monitoring": [
-                    "Model drift (real-time, market impact)",
-                    "Feature drift (macro-economic)",
-                    "Bias metric drift (critical groups)",
-                    "Explainability consistency alerts",
-                    "Approval rate drift",
-                    "Exception volume (manual reviews)",
-                ],
-                "incident_triggers": [
-                    "Regulatory non-compliance identified",
-                    "Significant financial loss attributed to model",
-                    "Public bias incident",
-                    "Fraud miss rate spike (e.g., $FNR_{fraud} > 0.002$)",
-                ],
-            },
+    },
+    "LLM": {
+        "Low": {
+            "controls": ["Prompt engineering guidelines (Healthcare)", "Basic content moderation (Healthcare)"],
+            "validation": ["Fluency and coherence (medical context)", "Relevance check (patient queries)"],
+            "monitoring": ["Output quality (grammar, medical terminology)", "Query volume (trends)"],
+            "incident_triggers": ["Inappropriate content generation (medical ethics breach)"],
         },
-        "LLM": {
-            "Low": {
-                "controls": ["Prompt guidelines (Finance)", "Content filtering (Financial terms)"],
-                "validation": ["Response relevance (financial queries)", "Grammar/Spelling (professional tone)"],
-                "monitoring": ["Output quality", "Usage patterns (customer queries)"],
-                "incident_triggers": ["Inappropriate financial advice"],
-            },
-            "Medium": {
-                "controls": [
-                    "Prompt guidelines (Finance)",
-                    "Content filtering (Financial terms)",
-                    "Fact verification (financial data, market feeds)",
-                    "Data privacy controls (PCI-DSS)",
-                ],
-                "validation": [
-                    "Accuracy of financial data extraction ($P(\\text{error}) < 0.01$)",
-                    "Hallucination rate (contextual, financial facts)",
-                    "Privacy compliance check (customer data)",
-                ],
-                "monitoring": ["Hallucination rate (financial facts)", "Data privacy alerts", "Information accuracy (financial advice)"],
-                "incident_triggers": ["Inaccurate financial advice provided", "Customer data leakage identified"],
-            },
-            "High": {
-                "controls": [
-                    "Prompt guidelines (Finance)",
-                    "Content filtering (Financial terms)",
-                    "Fact verification (financial data, market feeds)",
-                    "Data privacy controls (PCI-DSS)",
-                    "Human oversight for critical decisions (e.g., investment advice)",
-                    "Audit trail for LLM outputs (regulatory)",
-                ],
-                "validation": [
-                    "Accuracy of financial data extraction (strict, e.g., $P(\\text{error}) < 0.001$ for investment recommendations)",
-                    "Hallucination rate (financial context, e.g., $P(\\text{hallucination}) < 0.005$ for market forecasts)",
-                    "Privacy compliance (GDPR, CCPA, PCI-DSS)",
-                    "Robustness to prompt injection (financial scams)",
-                ],
-                "monitoring": [
-                    "Hallucination rate drift (financial facts, real-time)",
-                    "Data privacy alerts (real-time)",
-                    "Audit trail integrity (LLM decisions)",
-                    "Regulatory compliance drift",
-                ],
-                "incident_triggers": ["Material financial error from LLM advice", "Regulatory breach (data handling)", "Significant reputational damage (public misinformation)"],
-            },
+        "Medium": {
+            "controls": [
+                "Prompt engineering guidelines (Healthcare)",
+                "Advanced content moderation (Healthcare)",
+                "Fact-checking integration (medical literature)",
+                "Data privacy controls (PHI)",
+            ],
+            "validation": [
+                "Hallucination rate evaluation (medical facts, $P(\\text{hallucination}) < 0.05$)",
+                "Bias in generated text (gender, ethnicity)",
+                "Context adherence (patient history)",
+            ],
+            "monitoring": [
+                "Hallucination rate drift",
+                "Bias metric drift (text generation)",
+                "Information accuracy (medical claims)",
+            ],
+            "incident_triggers": ["Increased hallucination (medical advice)", "Misinformation generation (patient safety risk)"],
         },
-        "Agent": {
-            "Low": {
-                "controls": ["Action logging (Financial transactions)", "Access controls (Financial systems)"],
-                "validation": ["Basic task completion (e.g., report generation)", "Security checks (API access)"],
-                "monitoring": ["System uptime", "Transaction volume (reporting)"],
-                "incident_triggers": ["System downtime impacting operations"],
-            },
-            "Medium": {
-                "controls": [
-                    "Action logging (Financial transactions)",
-                    "Granular access controls (Financial systems)",
-                    "Reversibility protocols (transaction rollback)",
-                    "Transaction limits (individual/daily)",
-                ],
-                "validation": [
-                    "Complex transaction success rate (e.g., fund transfers)",
-                    "Fraud detection efficacy ($P(\\text{fraud detected}) > 0.9$)",
-                    "Unintended market impact (simulations)",
-                ],
-                "monitoring": ["Transaction limit breaches", "Error rates in automated trades", "Fraud detection performance (real-time alerts)"],
-                "incident_triggers": ["Unapproved transactions", "Automated fraud bypass (missed fraud)"],
-            },
-            "High": {
-                "controls": [
-                    "Action logging (Financial transactions)",
-                    "Granular access controls (Financial systems)",
-                    "Reversibility protocols (transaction rollback)",
-                    "Transaction limits (individual/daily)",
-                    "Real-time audit trails (all actions)",
-                    "Circuit breakers for autonomous actions (market volatility)",
-                ],
-                "validation": [
-                    "Critical transaction success rate (e.g., $P(\\text{fraudulent transaction}) < 0.0001$ for high-value transfers)",
-                    "Market stability analysis (agent impact)",
-                    "Compliance with financial regulations (e.g., Dodd-Frank, MiFID II)",
-                ],
-                "monitoring": [
-                    "Unauthorized access attempts",
-                    "Circuit breaker activations",
-                    "Audit trail integrity (transaction logs)",
-                    "Real-time P&L deviation (trading agents)",
-                    "Compliance dashboard alerts",
-                ],
-                "incident_triggers": ["Market manipulation attempt by agent", "Major financial loss event", "System compromise leading to asset loss"],
-            },
+        "High": {
+            "controls": [
+                "Prompt engineering guidelines (Healthcare)",
+                "Advanced content moderation (Healthcare)",
+                "Fact-checking integration (medical literature)",
+                "Data privacy controls (PHI)",
+                "Clinical verification workflow (human review for diagnoses)",
+                "Privacy-preserving methods (e.g., K-anonymity)",
+            ],
+            "validation": [
+                "Hallucination rate (strict thresholds, e.g., $P(\\text{hallucination}) < 0.005$ for diagnostic advice)",
+                "Bias in generated text for sensitive groups",
+                "Privacy leakage detection (PHI)",
+                "Clinical relevance and safety (adherence to guidelines)",
+            ],
+            "monitoring": [
+                "Hallucination rate drift (real-time, critical)",
+                "Privacy violation alerts (real-time)",
+                "Clinical override rates (for LLM suggestions)",
+                "Adherence to medical guidelines (automated checks)",
+            ],
+            "incident_triggers": ["Medical misinformation leading to harm", "Patient data breach (PHI exposure)", "Unsafe clinical recommendations generated"],
         },
-    }
+    },
+    "Agent": {
+        "Low": {
+            "controls": ["Action logging (Healthcare tasks)", "Basic authorization (Healthcare systems)"],
+            "validation": ["Action efficacy (e.g., appointment scheduling accuracy)", "Boundary adherence (role limits)"],
+            "monitoring": ["Action frequency", "Error rate (task completion)"],
+            "incident_triggers": ["Unauthorized action attempts"],
+        },
+        "Medium": {
+            "controls": [
+                "Action logging (Healthcare tasks)",
+                "Granular authorization (Healthcare systems)",
+                "Reversibility protocols (patient actions)",
+                "Autonomous action limits (e.g., dose adjustments)",
+            ],
+            "validation": [
+                "Complex task success rate (e.g., patient pathway optimization)",
+                "Unintended side effects (system interactions)",
+                "Reversal capability (action undo)",
+            ],
+            "monitoring": ["Autonomous action limits breached", "Error cascades (system-wide)", "Human intervention rates (agent-triggered)"],
+            "incident_triggers": ["Agent taking unintended medical actions", "Significant error rate spike (impacting patient flow)"],
+        },
+        "High": {
+            "controls": [
+                "Action logging (Healthcare tasks)",
+                "Granular authorization (Healthcare systems)",
+                "Reversibility protocols (patient actions)",
+                "Autonomous action limits (e.g., drug delivery)",
+                "Emergency stop mechanism (physical/digital)",
+                "Comprehensive audit trails (clinical decisions)",
+            ],
+            "validation": [
+                "Critical task success rate (e.g., $P(\\text{incorrect action}) < 0.001$ for life-critical functions)",
+                "Catastrophic failure modes (simulations)",
+                "Compliance with medical ethics and regulations (e.g., FDA)",
+            ],
+            "monitoring": [
+                "Unauthorized action attempts",
+                "Emergency stop activations",
+                "Audit trail integrity (real-time checks)",
+                "Deviation from pre-approved action space (e.g., off-label use)",
+            ],
+            "incident_triggers": ["Uncontrolled agent behavior (patient harm)", "Patient safety compromise (critical incident)", "System bypass attempts (security breach)"],
+        },
+    },
+}
 
 
-def get_default_sample_use_cases() -> List[Dict[str, Any]]:
-    return [
-        {
-            "id": "HC-ML-001",
-            "name": "Patient Triage and Prioritization (ML)",
-            "description": "An ML model predicts patient acuity to prioritize care in an emergency room, aiming to reduce patient wait times while maintaining safety. A key risk is **false negatives** for high-acuity patients.",
-            "sector": "Healthcare",
-            "system_type": "ML",
-            "risk_tier": "High",
+_DEFAULT_FINANCE_TEMPLATES: Dict[str, Any] = {
+    "ML": {
+        "Low": {
+            "controls": ["Data governance (Finance)", "Model documentation (Finance)"],
+            "validation": ["Basic performance metrics (accuracy, $P(\\text{correct}) > 0.85$)", "Input data validation (financial ranges)"],
+            "monitoring": ["Model drift", "Feature drift (economic indicators)"],
+            "incident_triggers": ["Significant performance drop (e.g., accuracy below $0.8$)"],
+        },
+        "Medium": {
+            "controls": [
+                "Data governance (Finance)",
+                "Model documentation (Finance)",
+                "Bias & fairness analysis (credit scoring)",
+                "Explainability (SHAP/LIME for loan officers)",
+            ],
+            "validation": [
+                "Advanced performance (Precision, Recall, F1 for fraud)",
+                "Bias fairness metrics (e.g., $0.8 \\le DIR \\le 1.25$ for protected groups in lending)",
+                "Explainability report consistency",
+            ],
+            "monitoring": ["Model drift (detailed)", "Feature drift", "Bias metric drift (by demographic)", "Explainability consistency"],
+            "incident_triggers": ["Unfair outcomes for protected groups", "Inconsistent explanations leading to appeals"],
+        },
+        "High": {
+            "controls": [
+                "Data governance (Finance)",
+                "Model documentation (Finance)",
+                "Bias & fairness analysis (credit scoring)",
+                "Explainability (SHAP/LIME for loan officers)",
+                "Auditability framework (SOX compliance)",
+                "Adherence to regulatory guidelines (e.g., CCPA, GDPR)",
+            ],
+            "validation": [
+                "Comprehensive performance (F1, AUROC, Precision@k for fraud, $FPR_{fraud} < 0.001$)",
+                "Bias fairness metrics (e.g., $0.8 \\le DIR \\le 1.25$ for all protected groups in credit decisions)",
+                "Robust explainability validation (counterfactuals)",
+                "Adversarial attack resistance (financial data)",
+            ],
+            "monitoring": [
+                "Model drift (real-time, market impact)",
+                "Feature drift (macro-economic)",
+                "Bias metric drift (critical groups)",
+                "Explainability consistency alerts",
+                "Approval rate drift",
+                "Exception volume (manual reviews)",
+            ],
+            "incident_triggers": [
+                "Regulatory non-compliance identified",
+                "Significant financial loss attributed to model",
+                "Public bias incident",
+                "Fraud miss rate spike (e.g., $FNR_{fraud} > 0.002$)",
+            ],
+        },
+    },
+    "LLM": {
+        "Low": {
+            "controls": ["Prompt guidelines (Finance)", "Content filtering (Financial terms)"],
+            "validation": ["Response relevance (financial queries)", "Grammar/Spelling (professional tone)"],
+            "monitoring": ["Output quality", "Usage patterns (customer queries)"],
+            "incident_triggers": ["Inappropriate financial advice"],
         },
-        {
-            "id": "FI-LLM-002",
-            "name": "Customer Service Chatbot (LLM)",
-            "description": "An LLM-powered chatbot answers customer queries regarding bank services, providing information on account balances, transaction history, and general FAQs. The main risk is providing **inaccurate information** or **hallucinating** responses.",
-            "sector": "Finance",
-            "system_type": "LLM",
-            "risk_tier": "Medium",
+        "Medium": {
+            "controls": [
+                "Prompt guidelines (Finance)",
+                "Content filtering (Financial terms)",
+                "Fact verification (financial data, market feeds)",
+                "Data privacy controls (PCI-DSS)",
+            ],
+            "validation": [
+                "Accuracy of financial data extraction ($P(\\text{error}) < 0.01$)",
+                "Hallucination rate (contextual, financial facts)",
+                "Privacy compliance check (customer data)",
+            ],
+            "monitoring": ["Hallucination rate (financial facts)", "Data privacy alerts", "Information accuracy (financial advice)"],
+            "incident_triggers": ["Inaccurate financial advice provided", "Customer data leakage identified"],
         },
-        {
-            "id": "HC-LLM-003",
-            "name": "Clinical Decision Support (LLM)",
-            "description": "An LLM provides diagnostic support and treatment recommendations to clinicians based on patient medical records and current research. A critical risk is **medical misinformation** or **hallucinations** leading to incorrect diagnoses or treatments.",
-            "sector": "Healthcare",
-            "system_type": "LLM",
-            "risk_tier": "High",
+        "High": {
+            "controls": [
+                "Prompt guidelines (Finance)",
+                "Content filtering (Financial terms)",
+                "Fact verification (financial data, market feeds)",
+                "Data privacy controls (PCI-DSS)",
+                "Human oversight for critical decisions (e.g., investment advice)",
+                "Audit trail for LLM outputs (regulatory)",
+            ],
+            "validation": [
+                "Accuracy of financial data extraction (strict, e.g., $P(\\text{error}) < 0.001$ for investment recommendations)",
+                "Hallucination rate (financial context, e.g., $P(\\text{hallucination}) < 0.005$ for market forecasts)",
+                "Privacy compliance (GDPR, CCPA, PCI-DSS)",
+                "Robustness to prompt injection (financial scams)",
+            ],
+            "monitoring": [
+                "Hallucination rate drift (financial facts, real-time)",
+                "Data privacy alerts (real-time)",
+                "Audit trail integrity (LLM decisions)",
+                "Regulatory compliance drift",
+            ],
+            "incident_triggers": ["Material financial error from LLM advice", "Regulatory breach (data handling)", "Significant reputational damage (public misinformation)"],
         },
-        {
-            "id": "FI-Agent-004",
-            "name": "Automated Fraud Detection Agent",
-            "description": "An AI agent monitors transactions in real-time and autonomously blocks suspicious financial activities to prevent financial loss. The key risk is **missing actual fraud (false negatives)** or **blocking legitimate transactions (false positives)**.",
-            "sector": "Finance",
-            "system_type": "Agent",
-            "risk_tier": "High",
+    },
+    "Agent": {
+        "Low": {
+            "controls": ["Action logging (Financial transactions)", "Access controls (Financial systems)"],
+            "validation": ["Basic task completion (e.g., report generation)", "Security checks (API access)"],
+            "monitoring": ["System uptime", "Transaction volume (reporting)"],
+            "incident_triggers": ["System downtime impacting operations"],
         },
-        {
-            "id": "HC-Agent-005",
-            "name": "Automated Medical Appointment Scheduler (Agent)",
-            "description": "An AI agent manages and optimizes patient appointment scheduling, sending reminders and handling rescheduling requests. A primary risk is **incorrect scheduling** or **HIPAA compliance** violations.",
-            "sector": "Healthcare",
-            "system_type": "Agent",
-            "risk_tier": "Low",
+        "Medium": {
+            "controls": [
+                "Action logging (Financial transactions)",
+                "Granular access controls (Financial systems)",
+                "Reversibility protocols (transaction rollback)",
+                "Transaction limits (individual/daily)",
+            ],
+            "validation": [
+                "Complex transaction success rate (e.g., fund transfers)",
+                "Fraud detection efficacy ($P(\\text{fraud detected}) > 0.9$)",
+                "Unintended market impact (simulations)",
+            ],
+            "monitoring": ["Transaction limit breaches", "Error rates in automated trades", "Fraud detection performance (real-time alerts)"],
+            "incident_triggers": ["Unapproved transactions", "Automated fraud bypass (missed fraud)"],
         },
-    ]
+        "High": {
+            "controls": [
+                "Action logging (Financial transactions)",
+                "Granular access controls (Financial systems)",
+                "Reversibility protocols (transaction rollback)",
+                "Transaction limits (individual/daily)",
+                "Real-time audit trails (all actions)",
+                "Circuit breakers for autonomous actions (market volatility)",
+            ],
+            "validation": [
+                "Critical transaction success rate (e.g., $P(\\text{fraudulent transaction}) < 0.0001$ for high-value transfers)",
+                "Market stability analysis (agent impact)",
+                "Compliance with financial regulations (e.g., Dodd-Frank, MiFID II)",
+            ],
+            "monitoring": [
+                "Unauthorized access attempts",
+                "Circuit breaker activations",
+                "Audit trail integrity (transaction logs)",
+                "Real-time P&L deviation (trading agents)",
+                "Compliance dashboard alerts",
+            ],
+            "incident_triggers": ["Market manipulation attempt by agent", "Major financial loss event", "System compromise leading to asset loss"],
+        },
+    },
+}
+
+
+_DEFAULT_SAMPLE_USE_CASES: List[Dict[str, Any]] = [
+    {
+        "id": "HC-ML-001",
+        "name": "Patient Triage and Prioritization (ML)",
+        "description": "An ML model predicts patient acuity to prioritize care in an emergency room, aiming to reduce patient wait times while maintaining safety. A key risk is **false negatives** for high-acuity patients.",
+        "sector": "Healthcare",
+        "system_type": "ML",
+        "risk_tier": "High",
+    },
+    {
+        "id": "FI-LLM-002",
+        "name": "Customer Service Chatbot (LLM)",
+        "description": "An LLM-powered chatbot answers customer queries regarding bank services, providing information on account balances, transaction history, and general FAQs. The main risk is providing **inaccurate information** or **hallucinating** responses.",
+        "sector": "Finance",
+        "system_type": "LLM",
+        "risk_tier": "Medium",
+    },
+    {
+        "id": "HC-LLM-003",
+        "name": "Clinical Decision Support (LLM)",
+        "description": "An LLM provides diagnostic support and treatment recommendations to clinicians based on patient medical records and current research. A critical risk is **medical misinformation** or **hallucinations** leading to incorrect diagnoses or treatments.",
+        "sector": "Healthcare",
+        "system_type": "LLM",
+        "risk_tier": "High",
+    },
+    {
+        "id": "FI-Agent-004",
+        "name": "Automated Fraud Detection Agent",
+        "description": "An AI agent monitors transactions in real-time and autonomously blocks suspicious financial activities to prevent financial loss. The key risk is **missing actual fraud (false negatives)** or **blocking legitimate transactions (false positives)**.",
+        "sector": "Finance",
+        "system_type": "Agent",
+        "risk_tier": "High",
+    },
+    {
+        "id": "HC-Agent-005",
+        "name": "Automated Medical Appointment Scheduler (Agent)",
+        "description": "An AI agent manages and optimizes patient appointment scheduling, sending reminders and handling rescheduling requests. A primary risk is **incorrect scheduling** or **HIPAA compliance** violations.",
+        "sector": "Healthcare",
+        "system_type": "Agent",
+        "risk_tier": "Low",
+    },
+]
+
+
+# The module-level defaults also seed the data files and are read-only; getters return fresh copies
+
+
+def get_default_healthcare_control_templates() -> Dict[str, Any]:
+    return _thaw(_DEFAULT_HEALTHCARE_TEMPLATES)
+
+
+def get_default_finance_control_templates() -> Dict[str, Any]:
+    return _thaw(_DEFAULT_FINANCE_TEMPLATES)
+
+
+def get_default_sample_use_cases() -> List[Dict[str, Any]]:
+    return _thaw(_DEFAULT_SAMPLE_USE_CASES)
 
 
 # -----------------------------
 # I/O helpers (data directory)
 # -----------------------------
 
+def _dumps_json(obj: Any) -> bytes:
+    """Serializes `obj` to pretty-printed (indent=2) UTF-8 JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads_json(data: bytes) -> Any:
+    """Parses UTF-8 JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# paths key -> (filename, built-in default written when the file is missing)
+_DEFAULT_DATA_FILES: Dict[str, Tuple[str, Any]] = {
+    "healthcare": ("healthcare_control_templates.json", _DEFAULT_HEALTHCARE_TEMPLATES),
+    "finance": ("finance_control_templates.json", _DEFAULT_FINANCE_TEMPLATES),
+    "use_cases": ("sample_use_cases.json", _DEFAULT_SAMPLE_USE_CASES),
+}
+
+# data_dir -> paths, for directories already checked/seeded in this process
+_ENSURED_DATA_DIRS: Dict[str, Dict[str, str]] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _default_file_bytes(key: str) -> bytes:
+    """Serialized default for `key`; the static content is encoded at most once per process."""
+    return _dumps_json(_DEFAULT_DATA_FILES[key][1])
+
+
 def ensure_data_files(data_dir: str = "data") -> Dict[str, str]:
     """
     Ensures the JSON files exist in `data_dir`.
     Returns a dict of filepaths.
     """
+    if data_dir in _ENSURED_DATA_DIRS:
+        return _ENSURED_DATA_DIRS[data_dir]
+
     os.makedirs(data_dir, exist_ok=True)
 
-    paths = {
-        "healthcare": os.path.join(data_dir, "healthcare_control_templates.json"),
-        "finance": os.path.join(data_dir, "finance_control_templates.json"),
-        "use_cases": os.path.join(data_dir, "sample_use_cases.json"),
-    }
+    paths = {key: os.path.join(data_dir, filename)
+             for key, (filename, _) in _DEFAULT_DATA_FILES.items()}
 
-    if not os.path.exists(paths["healthcare"]):
-        with open(paths["healthcare"], "w", encoding="utf-8") as f:
-            json.dump(get_default_healthcare_control_templates(), f, indent=2)
+    # One directory listing instead of a stat() per expected file
+    with os.scandir(data_dir) as it:
+        existing = {entry.name for entry in it}
+    for key, (filename, _) in _DEFAULT_DATA_FILES.items():
+        if filename not in existing:
+            _write_bytes_atomic(paths[key], _default_file_bytes(key))
 
-    if not os.path.exists(paths["finance"]):
-        with open(paths["finance"], "w", encoding="utf-8") as f:
-            json.dump(get_default_finance_control_templates(), f, indent=2)
+    _ENSURED_DATA_DIRS[data_dir] = paths
+    return paths
 
-    if not os.path.exists(paths["use_cases"]):
-        with open(paths["use_cases"], "w", encoding="utf-8") as f:
-            json.dump(get_default_sample_use_cases(), f, indent=2)
 
-    return paths
+def _write_bytes(path: str, payload: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
+def _write_bytes_atomic(path: str, payload: bytes) -> None:
+    """Writes via a temp file + os.replace so readers never see a partially written file."""
+    # deferred: only seeding missing data files needs tempfile
+    import tempfile
+
+    # Unique temp name per writer: concurrent sessions seeding the same file never share an inode
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                               prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; keep data files readable as plain open() did
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _write_and_hash(path: str, payload: bytes) -> str:
+    """Writes `payload` to `path` and returns its SHA-256, hashed from memory rather than re-read."""
+    _write_bytes(path, payload)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _write_artifacts(output_dir: str, artifacts: Dict[str, bytes], concurrent: bool = True) -> Dict[str, str]:
+    """
+    Writes filename -> bytes payloads into `output_dir` concurrently (file writes and hashing
+    release the GIL). Returns filename -> SHA-256 of the bytes written.
+    `concurrent=False` writes in the calling thread, for callers already running on a pool.
+    """
+    paths = [os.path.join(output_dir, name) for name in artifacts]
+    if not concurrent:
+        return dict(zip(artifacts, map(_write_and_hash, paths, artifacts.values())))
+
+    # deferred: concurrent.futures pulls in logging/threading; only the write/hash paths need it
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(4, len(artifacts) or 1)) as ex:
+        # dict() drains the iterator so any write error is raised here
+        return dict(zip(artifacts, ex.map(_write_and_hash, paths, artifacts.values())))
+
+
+def _intern_strings(obj: Any) -> Any:
+    """
+    Recursively sys.intern str keys/values so repeated labels share one object.
+    Lists become tuples. The result is the cached parse shared by every caller (and every
+    Streamlit session), so it is read-only: the public loaders hand out `_thaw` copies of it.
+    """
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    if isinstance(obj, dict):
+        return {sys.intern(k): _intern_strings(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return tuple(_intern_strings(v) for v in obj)
+    return obj
+
+
+def _thaw(obj: Any) -> Any:
+    """Plain dict/list deep copy of a cached value, so callers get JSON-native objects of their own."""
+    if isinstance(obj, dict):
+        return {k: _thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_thaw(v) for v in obj]
+    return obj
+
+
+@functools.lru_cache(maxsize=8)
+def _read_control_templates(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parses a templates file; keyed on (mtime, size) so an edited file is read again."""
+    with open(path, "rb") as f:
+        # controls/monitoring labels repeat across tiers; intern so the generators walk shared strs
+        return _intern_strings(_loads_json(f.read()))
+
+
+def _stat_data_file(data_dir: str, key: str) -> Tuple[str, os.stat_result]:
+    """Path and stat of a data file, re-seeding the default if it was deleted after the first check."""
+    path = ensure_data_files(data_dir)[key]
+    try:
+        return path, os.stat(path)
+    except FileNotFoundError:
+        # ensure_data_files memoizes per directory; forget it so the missing default is written again
+        _ENSURED_DATA_DIRS.pop(data_dir, None)
+        path = ensure_data_files(data_dir)[key]
+        return path, os.stat(path)
 
 
 def load_control_templates(sector: str, data_dir: str = "data") -> Dict[str, Any]:
-    """Loads control templates for a given sector from JSON files."""
+    """Loads control templates for a given sector from JSON files (parsed once until the file changes; returns a copy)."""
     sector_norm = sector.strip().lower()
-    ensure_data_files(data_dir)
 
-    if sector_norm == "healthcare":
-        path = os.path.join(data_dir, "healthcare_control_templates.json")
-    elif sector_norm == "finance":
-        path = os.path.join(data_dir, "finance_control_templates.json")
-    else:
+    if sector_norm not in ("healthcare", "finance"):
         raise ValueError(
             "Invalid sector specified. Choose 'Healthcare' or 'Finance'.")
 
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    path, stat = _stat_data_file(data_dir, sector_norm)
+    # The cached parse is shared by every caller and session; hand out a plain copy of it
+    return _thaw(_read_control_templates(path, stat.st_mtime_ns, stat.st_size))
+
+
+@functools.lru_cache(maxsize=8)
+def _read_sample_use_cases(path: str, mtime_ns: int, size: int) -> Tuple[Sequence[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Parses the use-case file and builds its id -> case index alongside it; keyed on
+    (mtime, size) so an edited file is read (and indexed) again.
+    """
+    with open(path, "rb") as f:
+        cases = _intern_strings(_loads_json(f.read()))
+    index: Dict[str, Dict[str, Any]] = {}
+    for case in cases:
+        index.setdefault(case.get("id"), case)  # first match wins, as with select_use_case's list scan
+    return cases, index
+
+
+def _use_cases_with_index(data_dir: str) -> Tuple[Sequence[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    path, stat = _stat_data_file(data_dir, "use_cases")
+    return _read_sample_use_cases(path, stat.st_mtime_ns, stat.st_size)
 
 
 def load_sample_use_cases(data_dir: str = "data") -> List[Dict[str, Any]]:
-    """Loads sample AI use cases from JSON files."""
-    ensure_data_files(data_dir)
-    path = os.path.join(data_dir, "sample_use_cases.json")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Loads sample AI use cases from JSON files (parsed once until the file changes; returns a copy)."""
+    return _thaw(_use_cases_with_index(data_dir)[0])
+
 
+def load_use_case_index(data_dir: str = "data") -> Dict[str, Dict[str, Any]]:
+    """Loads the id -> use case index built alongside `load_sample_use_cases` (returns a copy)."""
+    return _thaw(_use_cases_with_index(data_dir)[1])
 
-def select_use_case(use_case_id: str, all_cases: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """Selects a specific use case by its ID."""
+
+def select_use_case(
+    use_case_id: str,
+    all_cases: Union[List[Dict[str, Any]], Dict[str, Dict[str, Any]]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Selects a specific use case by its ID.
+    `all_cases` is either a list of use cases (scanned) or an id -> case index such as
+    `load_use_case_index()` returns (one dict lookup).
+    """
+    if isinstance(all_cases, dict):
+        return all_cases.get(use_case_id)
     for case in all_cases:
         if case.get("id") == use_case_id:
             return case
     return None
 
 
+def clear_caches() -> None:
+    """Drops the per-process loader and data-dir caches (e.g. between tests)."""
+    _read_control_templates.cache_clear()
+    _read_sample_use_cases.cache_clear()
+    _ENSURED_DATA_DIRS.clear()
+
+
 # -----------------------------
 # Core generators
 # -----------------------------
 
+_SECTOR_EMPHASIS: Dict[str, str] = {
+    "Healthcare": "Emphasis on False-Negative Risk, Clinical Override, Patient Safety, PHI Privacy.",
+    "Finance": "Emphasis on Explainability, Bias & Disparate Impact, Auditability, Financial Stability, Data Security.",
+}
+
+# (sector, system_type, risk_tier) -> static acceptance thresholds; one dict lookup per call
+_CHECKLIST_ACCEPTANCE_MD: Dict[Tuple[str, str, str], str] = {
+    ("Healthcare", "ML", "High"): (
+        "- **False Negative Rate (FNR) for target conditions:** $FNR_{target\\_condition} < 0.01$ (e.g., for critical diagnoses)\n"
+        "- **Bias in FNR across protected groups:** $\\left| FNR_{protected\\_group} - FNR_{overall} \\right| < 0.02$ \n"
+        "- **Adversarial Robustness:** Model accuracy drop $< 5\\%$ under specified adversarial attacks.\n"
+    ),
+    ("Healthcare", "LLM", "High"): (
+        "- **Hallucination Rate (Medical Advice):** $P(\\text{hallucination}) < 0.005$ for diagnostic support.\n"
+        "- **Privacy Leakage:** $P(\\text{PHI exposure}) < 0.001$ in synthetic data generation or responses.\n"
+    ),
+    ("Finance", "ML", "High"): (
+        "- **Disparate Impact Ratio (DIR) for credit decisions:** $0.8 \\le DIR \\le 1.25$ for all protected groups.\n"
+        "- **False Positive Rate (FPR) for fraud detection:** $FPR_{fraud} < 0.001$ (to minimize legitimate transaction blocks).\n"
+    ),
+    ("Finance", "LLM", "High"): (
+        "- **Financial Fact Accuracy:** $P(\\text{error}) < 0.001$ for extracted financial figures/advice.\n"
+        "- **Prompt Injection Robustness:** Successful injection rate $< 0.01$ in red-teaming scenarios.\n"
+    ),
+}
+
+_SNAPSHOT_ACCEPTANCE: Dict[Tuple[str, str, str], Tuple[str, ...]] = {
+    ("Healthcare", "ML", "High"): ("FNR < 0.01", "|FNR_group - FNR_overall| < 0.02"),
+    ("Healthcare", "LLM", "High"): ("P(hallucination) < 0.005", "P(PHI exposure) < 0.001"),
+    ("Finance", "ML", "High"): ("0.8 <= DIR <= 1.25", "FPR_fraud < 0.001"),
+    ("Finance", "LLM", "High"): ("P(error) < 0.001 (financial facts)", "Prompt injection rate < 0.01"),
+}
+
+# (sector, system_type) -> static "Rationale" bullets for the executive summary
+_SUMMARY_RATIONALE_MD: Dict[Tuple[str, str], str] = {
+    ("Healthcare", "ML"): (
+        "- **Patient Safety:** Mitigation of **False Negatives**, with strong clinical override and human-in-the-loop.\n"
+        "- **Ethical Bias:** Fairness checks across demographic groups.\n"
+        "- **Data Privacy:** HIPAA-oriented PHI protection controls.\n"
+    ),
+    ("Healthcare", "LLM"): (
+        "- **Medical Accuracy & Safety:** Preventing hallucinations and unsafe recommendations.\n"
+        "- **PHI Protection:** Privacy leakage detection and PHI safeguards.\n"
+    ),
+    ("Finance", "ML"): (
+        "- **Fairness & Integrity:** Bias/fairness analysis for high-stakes decisions (e.g., credit).\n"
+        "- **Explainability & Auditability:** Transparent rationale and compliance-aligned logging.\n"
+    ),
+    ("Finance", "LLM"): (
+        "- **Accuracy of Advice:** Fact verification and hallucination mitigation.\n"
+        "- **Regulatory Compliance:** PCI/GDPR/CCPA-oriented controls and audit trails.\n"
+    ),
+}
+
+
+_PLAYBOOK_NOT_FOUND = "Configuration not found for the given system type and risk tier."
+_CHECKLIST_NOT_FOUND = "Error: Validation configuration not found."
+
+
+def _playbook_from_config(sector: str, system_type: str, risk_tier: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "sector": sector,
+        "system_type": system_type,
+        "risk_tier": risk_tier,
+        "controls": config.get("controls", ()),
+        "sector_emphasis": _SECTOR_EMPHASIS.get(sector, "General AI risk management."),
+    }
+
+
+def _checklist_from_config(use_case: Dict[str, Any], config: Dict[str, Any]) -> str:
+    sector = use_case["sector"]
+    system_type = use_case["system_type"]
+    risk_tier = use_case["risk_tier"]
+    validation_items = config.get("validation", [])
+
+    parts = [f"# Validation Checklist for {sector} {system_type} ({risk_tier} Risk)\n\n"]
+    parts.append(f"**AI Initiative:** {use_case['name']} ({use_case['id']})\n")
+    parts.append(f"**Description:** {use_case['description']}\n\n")
+    parts.append("This checklist outlines the required validation activities and acceptance thresholds for deployment.\n\n")
+
+    if validation_items:
+        parts.append("- [ ] " + "\n- [ ] ".join(validation_items) + "\n")
+
+    parts.append("\n### Key Acceptance Thresholds:\n")
+    parts.append(_CHECKLIST_ACCEPTANCE_MD.get((sector, system_type, risk_tier), ""))
+
+    parts.append("\n### Evidence Requirements:\n")
+    parts.append("- Detailed validation report including methodology, results, and statistical significance.\n")
+    parts.append("- Dataset split documentation (training, validation, test, adversarial test sets).\n")
+    parts.append("- Explainability analysis artifacts (e.g., SHAP values, LIME explanations).\n")
+
+    return "".join(parts)
+
+
 def generate_sector_playbook(
     sector: str,
     system_type: str,
@@ -450,18 +719,9 @@ def generate_sector_playbook(
     """Generates the sector-specific AI playbook based on inputs."""
     try:
         config = templates[system_type][risk_tier]
-        return {
-            "sector": sector,
-            "system_type": system_type,
-            "risk_tier": risk_tier,
-            "controls": config.get("controls", []),
-            "sector_emphasis": {
-                "Healthcare": "Emphasis on False-Negative Risk, Clinical Override, Patient Safety, PHI Privacy.",
-                "Finance": "Emphasis on Explainability, Bias & Disparate Impact, Auditability, Financial Stability, Data Security.",
-            }.get(sector, "General AI risk management."),
-        }
     except KeyError:
-        return {"error": "Configuration not found for the given system type and risk tier."}
+        return {"error": _PLAYBOOK_NOT_FOUND}
+    return _playbook_from_config(sector, system_type, risk_tier, config)
 
 
 def generate_validation_checklist(
@@ -469,62 +729,54 @@ def generate_validation_checklist(
     templates: Dict[str, Any],
 ) -> str:
     """Generates a detailed validation checklist with specific requirements and thresholds."""
-    sector = use_case["sector"]
-    system_type = use_case["system_type"]
-    risk_tier = use_case["risk_tier"]
-
     try:
-        config = templates[system_type][risk_tier]
+        config = templates[use_case["system_type"]][use_case["risk_tier"]]
     except KeyError:
-        return "Error: Validation configuration not found."
+        return _CHECKLIST_NOT_FOUND
+    return _checklist_from_config(use_case, config)
 
-    validation_items = config.get("validation", [])
 
-    checklist = f"# Validation Checklist for {sector} {system_type} ({risk_tier} Risk)\n\n"
-    checklist += f"**AI Initiative:** {use_case['name']} ({use_case['id']})\n"
-    checklist += f"**Description:** {use_case['description']}\n\n"
-    checklist += "This checklist outlines the required validation activities and acceptance thresholds for deployment.\n\n"
-
-    for item in validation_items:
-        checklist += f"- [ ] {item}\n"
-
-    checklist += "\n### Key Acceptance Thresholds:\n"
-    if sector == "Healthcare" and system_type == "ML" and risk_tier == "High":
-        checklist += "- **False Negative Rate (FNR) for target conditions:** $FNR_{target\\_condition} < 0.01$ (e.g., for critical diagnoses)\n"
-        checklist += "- **Bias in FNR across protected groups:** $\\left| FNR_{protected\\_group} - FNR_{overall} \\right| < 0.02$ \n"
-        checklist += "- **Adversarial Robustness:** Model accuracy drop $< 5\\%$ under specified adversarial attacks.\n"
-    elif sector == "Healthcare" and system_type == "LLM" and risk_tier == "High":
-        checklist += "- **Hallucination Rate (Medical Advice):** $P(\\text{hallucination}) < 0.005$ for diagnostic support.\n"
-        checklist += "- **Privacy Leakage:** $P(\\text{PHI exposure}) < 0.001$ in synthetic data generation or responses.\n"
-    elif sector == "Finance" and system_type == "ML" and risk_tier == "High":
-        checklist += "- **Disparate Impact Ratio (DIR) for credit decisions:** $0.8 \\le DIR \\le 1.25$ for all protected groups.\n"
-        checklist += "- **False Positive Rate (FPR) for fraud detection:** $FPR_{fraud} < 0.001$ (to minimize legitimate transaction blocks).\n"
-    elif sector == "Finance" and system_type == "LLM" and risk_tier == "High":
-        checklist += "- **Financial Fact Accuracy:** $P(\\text{error}) < 0.001$ for extracted financial figures/advice.\n"
-        checklist += "- **Prompt Injection Robustness:** Successful injection rate $< 0.01$ in red-teaming scenarios.\n"
-
-    checklist += "\n### Evidence Requirements:\n"
-    checklist += "- Detailed validation report including methodology, results, and statistical significance.\n"
-    checklist += "- Dataset split documentation (training, validation, test, adversarial test sets).\n"
-    checklist += "- Explainability analysis artifacts (e.g., SHAP values, LIME explanations).\n"
-
-    return checklist
-
-
-def generate_monitoring_kpis(use_case: Dict[str, Any], templates: Dict[str, Any]) -> List[str]:
+def generate_monitoring_kpis(use_case: Dict[str, Any], templates: Dict[str, Any]) -> Sequence[str]:
     """Generates a list of monitoring KPIs."""
     try:
-        return templates[use_case["system_type"]][use_case["risk_tier"]].get("monitoring", [])
+        return templates[use_case["system_type"]][use_case["risk_tier"]].get("monitoring", ())
     except KeyError:
-        return []
+        return ()
 
 
-def generate_incident_triggers(use_case: Dict[str, Any], templates: Dict[str, Any]) -> List[str]:
+def generate_incident_triggers(use_case: Dict[str, Any], templates: Dict[str, Any]) -> Sequence[str]:
     """Generates a list of incident triggers."""
     try:
-        return templates[use_case["system_type"]][use_case["risk_tier"]].get("incident_triggers", [])
+        return templates[use_case["system_type"]][use_case["risk_tier"]].get("incident_triggers", ())
     except KeyError:
-        return []
+        return ()
+
+
+def generate_playbook_components(
+    use_case: Dict[str, Any],
+    templates: Dict[str, Any],
+) -> Tuple[Dict[str, Any], str, Sequence[str], Sequence[str]]:
+    """
+    Generates (playbook, validation checklist, KPIs, incident triggers) for a use case.
+    Same outputs as the four generators above, from a single templates[system_type][risk_tier] lookup.
+    """
+    system_type = use_case["system_type"]
+    risk_tier = use_case["risk_tier"]
+    try:
+        config = templates[system_type][risk_tier]
+    except KeyError:
+        return {"error": _PLAYBOOK_NOT_FOUND}, _CHECKLIST_NOT_FOUND, (), ()
+    return (
+        _playbook_from_config(use_case["sector"], system_type, risk_tier, config),
+        _checklist_from_config(use_case, config),
+        config.get("monitoring", ()),
+        config.get("incident_triggers", ()),
+    )
+
+
+# Checklist bullet "- [ ] item" -> "item"; one C-level scan instead of a per-line Python loop.
+# Shared with app.py so the checklist view and the snapshot's validation_requirements agree.
+CHECKLIST_ITEM_RE = re.compile(r"^[ \t]*- \[ \] [ \t]*(\S.*?)[ \t\r]*$", re.M)
 
 
 def _extract_validation_requirements_only(validation_markdown: str) -> List[str]:
@@ -532,30 +784,19 @@ def _extract_validation_requirements_only(validation_markdown: str) -> List[str]
     Extracts only the checklist portion (bullets) from the validation markdown.
     Keeps things simple/robust for your current formatting.
     """
-    lines = validation_markdown.splitlines()
-    out: List[str] = []
-    for ln in lines:
-        ln = ln.strip()
-        if ln.startswith("- [ ] "):
-            out.append(ln.replace("- [ ] ", "").strip())
-    return out
+    return CHECKLIST_ITEM_RE.findall(validation_markdown)
 
 
 def create_config_snapshot(
     use_case: Dict[str, Any],
     playbook: Dict[str, Any],
     validation_markdown: str,
-    kpis: List[str],
-    triggers: List[str],
+    kpis: Sequence[str],
+    triggers: Sequence[str],
 ) -> Dict[str, Any]:
     """Combines all generated configuration into a single snapshot."""
-    key = f"{use_case['sector']}_{use_case['system_type']}_{use_case['risk_tier']}"
-    acceptance = {
-        "Healthcare_ML_High": ["FNR < 0.01", "|FNR_group - FNR_overall| < 0.02"],
-        "Healthcare_LLM_High": ["P(hallucination) < 0.005", "P(PHI exposure) < 0.001"],
-        "Finance_ML_High": ["0.8 <= DIR <= 1.25", "FPR_fraud < 0.001"],
-        "Finance_LLM_High": ["P(error) < 0.001 (financial facts)", "Prompt injection rate < 0.01"],
-    }.get(key, [])
+    key = (use_case["sector"], use_case["system_type"], use_case["risk_tier"])
+    acceptance = list(_SNAPSHOT_ACCEPTANCE.get(key, ()))
 
     return {
         "use_case_details": use_case,
@@ -564,76 +805,107 @@ def create_config_snapshot(
         "acceptance_thresholds": acceptance,
         "monitoring_kpis": kpis,
         "incident_triggers": triggers,
-        "generated_timestamp": datetime.now().isoformat(),
+        # UTC, like the manifest timestamp, so every artifact of one export is stamped in the same zone
+        "generated_timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
     }
 
 
+# Executive summary text around the per-(sector, system_type) rationale bullets;
+# each block is filled with one format_map call
+_SUMMARY_HEADER_MD = (
+    "# Executive Summary: AI Risk Playbook for {name}\n\n"
+    "**Date:** {date}\n"
+    "**AI Risk Lead:** {lead}\n\n"
+    "## 1. AI Initiative Overview\n"
+    "**Name:** {name}\n"
+    "**ID:** {id}\n"
+    "**Description:** {description}\n"
+    "**Sector:** {sector}\n"
+    "**System Type:** {system_type}\n"
+    "**Risk Tier:** {risk_tier}\n\n"
+    "## 2. Rationale for Tailored Controls\n"
+    "Given the **{risk_tier} risk tier** and its deployment within the **{sector} sector**, "
+    "this AI system requires a highly specialized risk management framework. "
+    "For the '{name}' system, the primary concerns include:\n"
+)
+
+_SUMMARY_CONFIG_MD = (
+    "\n## 3. Key Configuration Elements\n"
+    "**Controls:** {controls}\n"
+    "**Validation Focus:** {validation}\n"
+    "**Acceptance Thresholds:** {thresholds}\n"
+    "**Monitoring KPIs:** {kpis}\n"
+    "**Incident Triggers:** {triggers}\n\n"
+    "This tailored playbook ensures comprehensive risk coverage, aligns with governance standards, "
+    "and prepares the system for rigorous validation and operational oversight."
+)
+
+
 def create_executive_summary(use_case: Dict[str, Any], snapshot: Dict[str, Any], ai_risk_lead: str = "Dr. Evelyn Reed") -> str:
     """Generates an executive summary in Markdown format."""
-    summary = f"# Executive Summary: AI Risk Playbook for {use_case['name']}\n\n"
-    summary += f"**Date:** {datetime.now().strftime('%Y-%m-%d')}\n"
-    summary += f"**AI Risk Lead:** {ai_risk_lead}\n\n"
-
-    summary += "## 1. AI Initiative Overview\n"
-    summary += f"**Name:** {use_case['name']}\n"
-    summary += f"**ID:** {use_case['id']}\n"
-    summary += f"**Description:** {use_case['description']}\n"
-    summary += f"**Sector:** {use_case['sector']}\n"
-    summary += f"**System Type:** {use_case['system_type']}\n"
-    summary += f"**Risk Tier:** {use_case['risk_tier']}\n\n"
-
-    summary += "## 2. Rationale for Tailored Controls\n"
-    summary += (
-        f"Given the **{use_case['risk_tier']} risk tier** and its deployment within the **{use_case['sector']} sector**, "
-        "this AI system requires a highly specialized risk management framework. "
-        f"For the '{use_case['name']}' system, the primary concerns include:\n"
-    )
-
-    if use_case["sector"] == "Healthcare":
-        if use_case["system_type"] == "ML":
-            summary += "- **Patient Safety:** Mitigation of **False Negatives**, with strong clinical override and human-in-the-loop.\n"
-            summary += "- **Ethical Bias:** Fairness checks across demographic groups.\n"
-            summary += "- **Data Privacy:** HIPAA-oriented PHI protection controls.\n"
-        elif use_case["system_type"] == "LLM":
-            summary += "- **Medical Accuracy & Safety:** Preventing hallucinations and unsafe recommendations.\n"
-            summary += "- **PHI Protection:** Privacy leakage detection and PHI safeguards.\n"
-    elif use_case["sector"] == "Finance":
-        if use_case["system_type"] == "ML":
-            summary += "- **Fairness & Integrity:** Bias/fairness analysis for high-stakes decisions (e.g., credit).\n"
-            summary += "- **Explainability & Auditability:** Transparent rationale and compliance-aligned logging.\n"
-        elif use_case["system_type"] == "LLM":
-            summary += "- **Accuracy of Advice:** Fact verification and hallucination mitigation.\n"
-            summary += "- **Regulatory Compliance:** PCI/GDPR/CCPA-oriented controls and audit trails.\n"
-
-    summary += "\n## 3. Key Configuration Elements\n"
-    summary += f"**Controls:** {', '.join(snapshot['ai_playbook'].get('controls', []))}\n"
-    summary += f"**Validation Focus:** {', '.join(snapshot.get('validation_requirements', []))}\n"
-    summary += f"**Acceptance Thresholds:** {'; '.join(snapshot.get('acceptance_thresholds', []))}\n"
-    summary += f"**Monitoring KPIs:** {', '.join(snapshot.get('monitoring_kpis', []))}\n"
-    summary += f"**Incident Triggers:** {', '.join(snapshot.get('incident_triggers', []))}\n\n"
-
-    summary += (
-        "This tailored playbook ensures comprehensive risk coverage, aligns with governance standards, "
-        "and prepares the system for rigorous validation and operational oversight."
-    )
-    return summary
+    # Date from the snapshot's own timestamp so both artifacts agree (and no second clock read)
+    generated = snapshot.get("generated_timestamp")
+    date_str = generated[:10] if isinstance(generated, str) else datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    return "".join((
+        _SUMMARY_HEADER_MD.format_map({
+            "name": use_case["name"],
+            "date": date_str,
+            "lead": ai_risk_lead,
+            "id": use_case["id"],
+            "description": use_case["description"],
+            "sector": use_case["sector"],
+            "system_type": use_case["system_type"],
+            "risk_tier": use_case["risk_tier"],
+        }),
+        _SUMMARY_RATIONALE_MD.get((use_case["sector"], use_case["system_type"]), ""),
+        _SUMMARY_CONFIG_MD.format_map({
+            "controls": ", ".join(snapshot["ai_playbook"].get("controls", ())),
+            "validation": ", ".join(snapshot.get("validation_requirements", ())),
+            "thresholds": "; ".join(snapshot.get("acceptance_thresholds", ())),
+            "kpis": ", ".join(snapshot.get("monitoring_kpis", ())),
+            "triggers": ", ".join(snapshot.get("incident_triggers", ())),
+        }),
+    ))
 
 
 # -----------------------------
 # Evidence manifest + hashing
 # -----------------------------
 
-def generate_file_hash(filepath: str) -> str:
-    """Generates the SHA-256 hash for a given file."""
-    hasher = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+def templates_digest(templates: Dict[str, Any]) -> str:
+    """Short BLAKE2b content digest of a templates dict, for use as a cache key."""
+    # Cache key only, not an integrity check: let FIPS-mode builds take the non-security path
+    return hashlib.blake2b(_dumps_json(templates), digest_size=16, usedforsecurity=False).hexdigest()
 
 
-def generate_evidence_manifest(output_directory: str, artifact_files: Optional[List[str]] = None) -> Dict[str, Any]:
-    """Generates an evidence manifest with SHA-256 hashes for all artifacts."""
+def generate_file_hash(filepath: str) -> str:
+    """Generates the SHA-256 hash for a given file."""
+    # Unbuffered: file_digest/mmap read straight from the fd, so a BufferedReader would only add a copy
+    with open(filepath, "rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: C-level read/update loop
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        hasher = hashlib.sha256()
+        # Hash the whole mapping in one C call instead of a Python read loop (mmap rejects empty files)
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        return hasher.hexdigest()
+
+
+def generate_evidence_manifest(
+    output_directory: str,
+    artifact_files: Optional[List[str]] = None,
+    known_hashes: Optional[Dict[str, str]] = None,
+    timestamp: Optional[str] = None,
+    write: bool = True,
+) -> Dict[str, Any]:
+    """
+    Generates an evidence manifest with SHA-256 hashes for all artifacts.
+    `known_hashes` (filename -> SHA-256) covers files the caller just wrote; only the rest are read back.
+    `timestamp` lets the caller stamp the manifest with its own generation time (default: now, UTC).
+    `write=False` returns the manifest without writing evidence_manifest.json.
+    """
     if artifact_files is None:
         artifact_files = [
             "sector_playbook.json",
@@ -644,33 +916,43 @@ def generate_evidence_manifest(output_directory: str, artifact_files: Optional[L
             "config_snapshot.json",
         ]
 
+    known_hashes = known_hashes or {}
+    filepaths = [os.path.join(output_directory, filename)
+                 for filename in artifact_files]
+    digests = {fp: known_hashes[fn]
+               for fn, fp in zip(artifact_files, filepaths) if fn in known_hashes}
+    pending = [(fn, fp) for fn, fp in zip(artifact_files, filepaths) if fp not in digests]
+    present: List[str] = []
+    if pending:
+        # One directory listing instead of a stat() per artifact (nested names still stat)
+        try:
+            with os.scandir(output_directory) as it:
+                listed = {entry.name for entry in it if entry.is_file()}
+        except FileNotFoundError:
+            listed = set()
+        present = [fp for fn, fp in pending
+                   if (fn in listed if os.path.basename(fn) == fn else os.path.exists(fp))]
+
+    if present:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # hashlib releases the GIL while digesting, so threads hash files in parallel
+        with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(present))) as ex:
+            digests.update(zip(present, ex.map(generate_file_hash, present)))
+
     manifest: Dict[str, Any] = {
-        "manifest_timestamp": datetime.now().isoformat(), "artifacts": []}
-
-    for filename in artifact_files:
-        filepath = os.path.join(output_directory, filename)
-        if os.path.exists(filepath):
-            manifest["artifacts"].append(
-                {
-                    "filename": filename,
-                    "filepath": filepath,
-                    "sha256_hash": generate_file_hash(filepath),
-                }
-            )
-        else:
-            manifest["artifacts"].append(
-                {
-                    "filename": filename,
-                    "filepath": filepath,
-                    "status": "MISSING",
-                    "notes": "File not found or not generated.",
-                }
-            )
-
-    manifest_filename = os.path.join(
-        output_directory, "evidence_manifest.json")
-    with open(manifest_filename, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=2)
+        "manifest_timestamp": timestamp or datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "artifacts": [
+            {"filename": filename, "filepath": filepath, "sha256_hash": digests[filepath]}
+            if filepath in digests else
+            {"filename": filename, "filepath": filepath,
+             "status": "MISSING", "notes": "File not found or not generated."}
+            for filename, filepath in zip(artifact_files, filepaths)
+        ],
+    }
+
+    if write:
+        _write_bytes(os.path.join(output_directory, "evidence_manifest.json"), _dumps_json(manifest))
 
     return manifest
 
@@ -679,17 +961,18 @@ def generate_evidence_manifest(output_directory: str, artifact_files: Optional[L
 # Top-level orchestration API
 # -----------------------------
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GenerationResult:
     use_case: Dict[str, Any]
     playbook: Dict[str, Any]
     validation_checklist_md: str
-    monitoring_kpis: List[str]
-    incident_triggers: List[str]
+    monitoring_kpis: Sequence[str]
+    incident_triggers: Sequence[str]
     config_snapshot: Dict[str, Any]
     executive_summary_md: str
     evidence_manifest: Dict[str, Any]
     output_dir: str
+    artifacts: Dict[str, bytes]
 
 
 def generate_all_artifacts(
@@ -698,73 +981,139 @@ def generate_all_artifacts(
     output_dir: str = "generated_artifacts",
     ai_risk_lead: str = "Dr. Evelyn Reed",
     write_files: bool = True,
+    concurrent_writes: bool = True,
 ) -> GenerationResult:
     """
-    Main function to be called from app.py.
+    End-to-end entry point (CLI and batch use).
 
     - Loads data
     - Selects use case
     - Generates playbook, validation checklist, KPIs, triggers
-    - Generates snapshot + executive summary
-    - Optionally writes artifacts to disk
+    - Packages them via `package_artifacts` (snapshot, summary, serialized bytes, optional disk write)
     - Always returns everything as in-memory objects
     """
-    all_cases = load_sample_use_cases(data_dir=data_dir)
-    use_case = select_use_case(use_case_id, all_cases)
+    # Look up in the cached index; only the selected case is copied out of it
+    use_case = select_use_case(use_case_id, _use_cases_with_index(data_dir)[1])
     if not use_case:
         raise ValueError(f"Use case with ID {use_case_id} not found.")
+    use_case = _thaw(use_case)
 
     templates = load_control_templates(use_case["sector"], data_dir=data_dir)
 
-    playbook = generate_sector_playbook(
-        sector=use_case["sector"],
-        system_type=use_case["system_type"],
-        risk_tier=use_case["risk_tier"],
-        templates=templates,
-    )
-    validation_md = generate_validation_checklist(
-        use_case=use_case, templates=templates)
-    kpis = generate_monitoring_kpis(use_case=use_case, templates=templates)
-    triggers = generate_incident_triggers(
+    playbook, validation_md, kpis, triggers = generate_playbook_components(
         use_case=use_case, templates=templates)
 
-    snapshot = create_config_snapshot(
+    return package_artifacts(
         use_case=use_case,
         playbook=playbook,
-        validation_markdown=validation_md,
+        validation_md=validation_md,
         kpis=kpis,
         triggers=triggers,
+        output_dir=output_dir,
+        ai_risk_lead=ai_risk_lead,
+        write_files=write_files,
+        concurrent_writes=concurrent_writes,
     )
 
-    executive_md = create_executive_summary(
-        use_case=use_case, snapshot=snapshot, ai_risk_lead=ai_risk_lead)
 
-    os.makedirs(output_dir, exist_ok=True)
+def generate_many(
+    use_case_ids: List[str],
+    data_dir: str = "data",
+    output_dir: str = "generated_artifacts",
+    ai_risk_lead: str = "Dr. Evelyn Reed",
+    write_files: bool = True,
+) -> List[GenerationResult]:
+    """
+    Batch entry point: runs `generate_all_artifacts` for each id into `output_dir/<id>`.
+
+    Use cases and each sector's templates are loaded once (the loaders are cached); unknown ids
+    raise ValueError before any work starts. Repeated ids run once (two workers would otherwise
+    write the same `output_dir/<id>` files concurrently). Cases run on one shared thread pool so
+    their file writes overlap; each case writes its own files in its worker thread, so no
+    per-case pool is nested inside it. Results are returned in first-seen input order.
+    """
+    use_case_ids = list(dict.fromkeys(use_case_ids))
+    index = _use_cases_with_index(data_dir)[1]
+    missing = [uid for uid in use_case_ids if uid not in index]
+    if missing:
+        raise ValueError(f"Use case(s) not found: {', '.join(missing)}.")
 
-    if write_files:
-        # Write core artifacts
-        with open(os.path.join(output_dir, "sector_playbook.json"), "w", encoding="utf-8") as f:
-            json.dump(playbook, f, indent=2)
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _one(uid: str) -> GenerationResult:
+        return generate_all_artifacts(
+            use_case_id=uid,
+            data_dir=data_dir,
+            output_dir=os.path.join(output_dir, uid),
+            ai_risk_lead=ai_risk_lead,
+            write_files=write_files,
+            concurrent_writes=False,
+        )
 
-        with open(os.path.join(output_dir, "validation_checklist.md"), "w", encoding="utf-8") as f:
-            f.write(validation_md)
+    with ThreadPoolExecutor(max_workers=min(4, len(use_case_ids) or 1)) as ex:
+        return list(ex.map(_one, use_case_ids))
 
-        with open(os.path.join(output_dir, "monitoring_kpis.json"), "w", encoding="utf-8") as f:
-            json.dump(kpis, f, indent=2)
 
-        with open(os.path.join(output_dir, "incident_triggers.json"), "w", encoding="utf-8") as f:
-            json.dump(triggers, f, indent=2)
+def package_artifacts(
+    use_case: Dict[str, Any],
+    playbook: Dict[str, Any],
+    validation_md: str,
+    kpis: Sequence[str],
+    triggers: Sequence[str],
+    output_dir: str = "generated_artifacts",
+    ai_risk_lead: str = "Dr. Evelyn Reed",
+    write_files: bool = True,
+    concurrent_writes: bool = True,
+) -> GenerationResult:
+    """
+    Builds the exportable artifact set from already-generated playbook components.
+
+    - Generates snapshot + executive summary
+    - Serializes each artifact once (`GenerationResult.artifacts`: filename -> bytes)
+    - Hashes every artifact into the evidence manifest (included in `artifacts`)
+    - Optionally writes the artifacts and the manifest to disk; `concurrent_writes=False`
+      writes them in the calling thread (batch mode, which already runs cases on one pool)
+    """
+    snapshot = create_config_snapshot(
+        use_case=use_case,
+        playbook=playbook,
+        validation_markdown=validation_md,
+        kpis=kpis,
+        triggers=triggers,
+    )
 
-        with open(os.path.join(output_dir, "config_snapshot.json"), "w", encoding="utf-8") as f:
-            json.dump(snapshot, f, indent=2)
+    executive_md = create_executive_summary(
+        use_case=use_case, snapshot=snapshot, ai_risk_lead=ai_risk_lead)
 
-        with open(os.path.join(output_dir, "executive_summary.md"), "w", encoding="utf-8") as f:
-            f.write(executive_md)
+    # Serialize every artifact exactly once; the same bytes feed disk and any ZIP export.
+    artifacts: Dict[str, bytes] = {
+        "sector_playbook.json": _dumps_json(playbook),
+        "validation_checklist.md": validation_md.encode("utf-8"),
+        "monitoring_kpis.json": _dumps_json(kpis),
+        "incident_triggers.json": _dumps_json(triggers),
+        "config_snapshot.json": _dumps_json(snapshot),
+        "executive_summary.md": executive_md.encode("utf-8"),
+    }
 
-        evidence = generate_evidence_manifest(output_dir)
+    manifest_ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    if write_files:
+        os.makedirs(output_dir, exist_ok=True)
+        hashes = _write_artifacts(output_dir, artifacts, concurrent=concurrent_writes)
     else:
-        evidence = {"manifest_timestamp": datetime.now().isoformat(
-        ), "artifacts": [], "notes": "write_files=False, no files hashed."}
+        # Nothing on disk: hash the in-memory bytes so the ZIP still carries a full manifest
+        hashes = {name: hashlib.sha256(payload).hexdigest() for name, payload in artifacts.items()}
+
+    evidence = generate_evidence_manifest(
+        output_dir, known_hashes=hashes, timestamp=manifest_ts, write=False)
+    if not write_files:
+        # Nothing was persisted, so there is no path to record; the filename is the ZIP entry
+        for entry in evidence["artifacts"]:
+            entry["filepath"] = None
+    # Serialize once; the same bytes go into the ZIP and, when writing, to disk
+    artifacts["evidence_manifest.json"] = _dumps_json(evidence)
+    if write_files:
+        _write_bytes(os.path.join(output_dir, "evidence_manifest.json"),
+                     artifacts["evidence_manifest.json"])
 
     return GenerationResult(
         use_case=use_case,
@@ -776,6 +1125,7 @@ def generate_all_artifacts(
         executive_summary_md=executive_md,
         evidence_manifest=evidence,
         output_dir=output_dir,
+        artifacts=artifacts,
     )
 
 
@@ -788,18 +1138,22 @@ def main() -> None:
     CLI mode:
       python source.py
       python source.py HC-ML-001
+      python source.py HC-ML-001 FI-LLM-002   (batch: one subdirectory per id)
     """
-    import sys
-
-    use_case_id = sys.argv[1] if len(sys.argv) > 1 else "HC-ML-001"
-    result = generate_all_artifacts(use_case_id=use_case_id, write_files=True)
-
-    print(
-        f"Selected AI Initiative: {result.use_case['name']} ({result.use_case['id']})")
-    print(
-        f"Sector: {result.use_case['sector']} | Type: {result.use_case['system_type']} | Risk: {result.use_case['risk_tier']}")
-    print(f"Artifacts written to: {result.output_dir}")
-    print(json.dumps(result.evidence_manifest, indent=2))
+    use_case_ids = sys.argv[1:] or ["HC-ML-001"]
+    if len(use_case_ids) == 1:
+        results = [generate_all_artifacts(use_case_id=use_case_ids[0], write_files=True)]
+    else:
+        results = generate_many(use_case_ids, write_files=True)
+
+    for result in results:
+        print(
+            f"Selected AI Initiative: {result.use_case['name']} ({result.use_case['id']})")
+        print(
+            f"Sector: {result.use_case['sector']} | Type: {result.use_case['system_type']} | Risk: {result.use_case['risk_tier']}")
+        print(f"Artifacts written to: {result.output_dir}")
+        # Reuse the bytes already written to evidence_manifest.json instead of re-encoding
+        print(result.artifacts["evidence_manifest.json"].decode("utf-8"))
 
 
 if __name__ == "__main__":
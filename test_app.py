@@ -1,76 +1,115 @@
 
 import pytest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from streamlit.runtime.media_file_manager import MediaFileManager
 from streamlit.testing.v1 import AppTest
+import dataclasses
+import hashlib
+import copy
 import json
 import os
+import pickle
 import io
-from datetime import datetime
-
-# Mock data for source.py functions
-MOCK_USE_CASES = [
-    {"id": "UC001", "name": "Fraud Detection", "description": "Detects fraudulent transactions.", "sector": "Finance", "system_type": "Machine Learning", "risk_tier": "High"},
-    {"id": "UC002", "name": "Patient Diagnosis", "description": "Assists in diagnosing diseases.", "sector": "Healthcare", "system_type": "LLM", "risk_tier": "Critical"},
-    {"id": "UC003", "name": "Credit Scoring", "description": "Calculates creditworthiness.", "sector": "Finance", "system_type": "Machine Learning", "risk_tier": "Medium"},
-]
-
-MOCK_CONTROL_TEMPLATES = {
-    "Finance": {"controls": ["Financial Control 1", "Financial Control 2"]},
-    "Healthcare": {"controls": ["Healthcare Control 1", "Healthcare Control 2"]},
-}
-
-MOCK_PLAYBOOK = {"playbook_data": "Generated playbook content for UC001"}
+import zipfile
+from types import MappingProxyType
+
+import source
+from source import GenerationResult
+
+# Mock data for source.py functions. Frozen so the session-wide patches can
+# hand out the same objects to every test without one test mutating another's.
+MOCK_USE_CASES = (
+    MappingProxyType({"id": "UC001", "name": "Fraud Detection", "description": "Detects fraudulent transactions.", "sector": "Finance", "system_type": "Machine Learning", "risk_tier": "High"}),
+    MappingProxyType({"id": "UC002", "name": "Patient Diagnosis", "description": "Assists in diagnosing diseases.", "sector": "Healthcare", "system_type": "LLM", "risk_tier": "Critical"}),
+    MappingProxyType({"id": "UC003", "name": "Credit Scoring", "description": "Calculates creditworthiness.", "sector": "Finance", "system_type": "Machine Learning", "risk_tier": "Medium"}),
+)
+
+MOCK_CONTROL_TEMPLATES = MappingProxyType({
+    "Finance": MappingProxyType({"controls": ("Financial Control 1", "Financial Control 2")}),
+    "Healthcare": MappingProxyType({"controls": ("Healthcare Control 1", "Healthcare Control 2")}),
+})
+
+MOCK_PLAYBOOK = MappingProxyType({
+    "sector": "Finance",
+    "system_type": "Machine Learning",
+    "risk_tier": "High",
+    "controls": ("Financial Control 1", "Financial Control 2"),
+    "sector_emphasis": "Mock sector emphasis.",
+})
 MOCK_VALIDATION_CHECKLIST = "Generated validation checklist content for UC001"
-MOCK_MONITORING_KPIS = {"kpis": ["KPI A", "KPI B"]}
-MOCK_INCIDENT_TRIGGERS = {"triggers": ["Trigger X", "Trigger Y"]}
-MOCK_CONFIG_SNAPSHOT = {"snapshot_key": "snapshot_value"}
+MOCK_MONITORING_KPIS = ("KPI A", "KPI B")
+MOCK_INCIDENT_TRIGGERS = ("Trigger X", "Trigger Y")
+MOCK_CONFIG_SNAPSHOT = MappingProxyType({"snapshot_key": "snapshot_value"})
 MOCK_EXECUTIVE_SUMMARY = "This is a mock executive summary."
 # Reflects the expected files that would be generated and included in the evidence manifest
-MOCK_EVIDENCE_MANIFEST = {
-    "sector_playbook.json": "hash_playbook",
-    "validation_checklist.md": "hash_checklist",
-    "monitoring_kpis.json": "hash_kpis",
-    "incident_triggers.json": "hash_triggers",
-    "config_snapshot.json": "hash_snapshot",
-    "executive_summary.md": "hash_summary"
-}
+MOCK_EVIDENCE_MANIFEST = MappingProxyType({
+    "manifest_timestamp": "2025-01-01T00:00:00+00:00",
+    "artifacts": tuple(
+        MappingProxyType({"filename": filename, "filepath": f"reports/session13/{filename}", "sha256_hash": digest})
+        for filename, digest in (
+            ("sector_playbook.json", "hash_playbook"),
+            ("validation_checklist.md", "hash_checklist"),
+            ("monitoring_kpis.json", "hash_kpis"),
+            ("incident_triggers.json", "hash_triggers"),
+            ("config_snapshot.json", "hash_snapshot"),
+            ("executive_summary.md", "hash_summary"),
+        )
+    ),
+})
+
+# Generated artifact bytes as the mocked package_artifacts returns them (filename -> payload)
+MOCK_ARTIFACTS = MappingProxyType({
+    "sector_playbook.json": b"{}",
+    "validation_checklist.md": MOCK_VALIDATION_CHECKLIST.encode("utf-8"),
+    "monitoring_kpis.json": b"{}",
+    "incident_triggers.json": b"{}",
+    "config_snapshot.json": b"{}",
+    "executive_summary.md": MOCK_EXECUTIVE_SUMMARY.encode("utf-8"),
+    "evidence_manifest.json": b"{}",
+})
+
+
+def _mock_package_artifacts(**kwargs):
+    return GenerationResult(
+        use_case=kwargs["use_case"],
+        playbook=kwargs["playbook"],
+        validation_checklist_md=kwargs["validation_md"],
+        monitoring_kpis=kwargs["kpis"],
+        incident_triggers=kwargs["triggers"],
+        config_snapshot=MOCK_CONFIG_SNAPSHOT,
+        executive_summary_md=MOCK_EXECUTIVE_SUMMARY,
+        evidence_manifest=MOCK_EVIDENCE_MANIFEST,
+        output_dir=kwargs["output_dir"],
+        artifacts=dict(MOCK_ARTIFACTS),
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _static_patches():
+    """
+    Patches the source.py functions app.py calls that only return fixed mock data.
+    These are entered once per session rather than re-entered for every test.
+    """
+    with ExitStack() as stack:
+        for target, kwargs in (
+            ("source.load_sample_use_cases", {"return_value": MOCK_USE_CASES}),
+            ("source.load_control_templates", {"side_effect": lambda sector, data_dir="data": MOCK_CONTROL_TEMPLATES.get(sector, {})}),
+            ("source.templates_digest", {"side_effect": lambda templates: str(sorted(templates))}),
+            # st.cache_data pickles the components, so the playbook goes out as a plain dict
+            ("source.generate_playbook_components", {"side_effect": lambda use_case, templates: (dict(MOCK_PLAYBOOK), MOCK_VALIDATION_CHECKLIST, MOCK_MONITORING_KPIS, MOCK_INCIDENT_TRIGGERS)}),
+        ):
+            stack.enter_context(patch(target, **kwargs))
+        yield
 
 @pytest.fixture(autouse=True)
 def mock_external_dependencies():
     """
-    Mocks external dependencies like source.py functions and file system operations.
-    """
-    m_open = mock_open()
-
-    # Mock os.walk to simulate files being present in the output_dir_path
-    def mock_os_walk_side_effect(path):
-        # Simulate files created by generate_final_artifacts_callback for zipping
-        mock_files = [
-            "sector_playbook.json",
-            "validation_checklist.md",
-            "monitoring_kpis.json",
-            "incident_triggers.json",
-            "config_snapshot.json",
-            "executive_summary.md",
-        ]
-        return [(path, [], mock_files)] # Yield once for the base directory
-
-    with patch("source.load_sample_use_cases", return_value=MOCK_USE_CASES), \
-         patch("source.select_use_case", side_effect=lambda id, ucs: next((uc for uc in ucs if uc['id'] == id), None)), \
-         patch("source.load_control_templates", side_effect=lambda sector: MOCK_CONTROL_TEMPLATES.get(sector, {})), \
-         patch("source.generate_sector_playbook", return_value=MOCK_PLAYBOOK), \
-         patch("source.generate_validation_checklist", return_value=MOCK_VALIDATION_CHECKLIST), \
-         patch("source.generate_monitoring_kpis", return_value=MOCK_MONITORING_KPIS), \
-         patch("source.generate_incident_triggers", return_value=MOCK_INCIDENT_TRIGGERS), \
-         patch("source.create_config_snapshot", return_value=MOCK_CONFIG_SNAPSHOT), \
-         patch("source.create_executive_summary", return_value=MOCK_EXECUTIVE_SUMMARY), \
-         patch("source.generate_evidence_manifest", return_value=MOCK_EVIDENCE_MANIFEST), \
-         patch("os.makedirs"), \
-         patch("os.path.join", side_effect=os.path.join), \
-         patch("os.path.relpath", side_effect=os.path.relpath), \
-         patch("os.walk", side_effect=mock_os_walk_side_effect), \
-         patch("builtins.open", m_open): # Mock open for all file system operations
-        yield m_open # Yield the mock_open object to inspect calls to it in tests
+    Mocks the export step, whose calls are inspected per test; nothing is written to disk.
+    """
+    with patch("source.package_artifacts", side_effect=_mock_package_artifacts) as m_package:
+        yield m_package # Yield the mock to inspect calls to it in tests
 
 def test_initial_app_load():
     """
@@ -119,9 +158,9 @@ def test_load_data_and_select_use_case():
     assert at.session_state.current_risk_tier == MOCK_USE_CASES[0]['risk_tier']
     assert at.session_state.current_sector_templates == MOCK_CONTROL_TEMPLATES.get(MOCK_USE_CASES[0]['sector'])
 
-    # Change selected use case using the selectbox (selectbox[2])
+    # Change selected use case using the use case selectbox
     second_use_case_display = f"{MOCK_USE_CASES[1]['name']} ({MOCK_USE_CASES[1]['id']})"
-    at.selectbox[2].set_value(second_use_case_display).run()
+    at.selectbox(key="selected_use_case_display").set_value(second_use_case_display).run()
 
     assert at.session_state.selected_use_case_display == second_use_case_display
     assert at.session_state.selected_use_case == MOCK_USE_CASES[1]
@@ -130,9 +169,10 @@ def test_load_data_and_select_use_case():
     assert at.session_state.current_risk_tier == MOCK_USE_CASES[1]['risk_tier']
     assert at.session_state.current_sector_templates == MOCK_CONTROL_TEMPLATES.get(MOCK_USE_CASES[1]['sector'])
 
-    # Verify "Generate Playbook Components" button (button[1]) is enabled
-    assert at.button[1].label == "Generate Playbook Components"
-    assert at.button[1].disabled is False
+    # Verify "Generate Playbook Components" button is enabled
+    generate_button = at.button(key="generate_components_button")
+    assert generate_button.label == "Generate Playbook Components"
+    assert generate_button.disabled is False
 
 def test_generate_playbook_components():
     """
@@ -140,15 +180,15 @@ def test_generate_playbook_components():
     """
     at = AppTest.from_file("app.py").run()
     at.button[0].click().run() # Load data
-    at.button[1].click().run() # Click "Generate Playbook Components" (button[1])
+    at.button(key="generate_components_button").click().run()
 
     assert at.session_state.playbook_components_generated
     assert at.session_state.ai_playbook == MOCK_PLAYBOOK
     assert at.session_state.validation_checklist_content == MOCK_VALIDATION_CHECKLIST
     assert at.session_state.monitoring_kpis == MOCK_MONITORING_KPIS
     assert at.session_state.incident_triggers == MOCK_INCIDENT_TRIGGERS
-    assert at.success[1].value == "Playbook components generated!" # Check the second success message
-    assert at.button[1].disabled is True # Button should be disabled after generation
+    assert at.success[0].value == "Playbook components generated!" # Callback message renders first
+    assert at.button(key="generate_components_button").disabled is True # Button should be disabled after generation
 
 def test_navigation_and_control_selection_preview_page():
     """
@@ -156,14 +196,20 @@ def test_navigation_and_control_selection_preview_page():
     """
     at = AppTest.from_file("app.py").run()
     at.button[0].click().run() # Load data
-    at.button[1].click().run() # Generate playbook components
+    at.button(key="generate_components_button").click().run()
 
-    # Navigate to "Control Selection Preview" using the sidebar selectbox (selectbox[0])
-    at.selectbox[0].set_value("Control Selection Preview").run()
+    # Navigate to "Control Selection Preview" using the sidebar navigation selectbox
+    at.selectbox(key="current_page").set_value("Control Selection Preview").run()
 
     assert at.session_state.current_page == "Control Selection Preview"
     assert "Sector-Specific AI Control Playbook Preview" in at.markdown[0].value
-    assert at.json[0].value == MOCK_PLAYBOOK # Verify playbook content is displayed
+    # Verify playbook content is displayed
+    metrics = {m.label: m.value for m in at.metric}
+    assert metrics["Sector"] == MOCK_PLAYBOOK["sector"]
+    assert metrics["System Type"] == MOCK_PLAYBOOK["system_type"]
+    assert metrics["Risk Tier"] == MOCK_PLAYBOOK["risk_tier"]
+    for control in MOCK_PLAYBOOK["controls"]:
+        assert any(control in m.value for m in at.markdown)
 
 def test_control_selection_preview_page_warning_if_not_generated():
     """
@@ -180,14 +226,14 @@ def test_navigation_and_validation_checklist_builder_page():
     """
     at = AppTest.from_file("app.py").run()
     at.button[0].click().run() # Load data
-    at.button[1].click().run() # Generate playbook components
+    at.button(key="generate_components_button").click().run()
 
     # Navigate to "Validation Checklist Builder"
-    at.selectbox[0].set_value("Validation Checklist Builder").run()
+    at.selectbox(key="current_page").set_value("Validation Checklist Builder").run()
 
     assert at.session_state.current_page == "Validation Checklist Builder"
     assert "Validation Checklist with Specific Requirements and Thresholds" in at.markdown[0].value
-    assert at.markdown[5].value == MOCK_VALIDATION_CHECKLIST # Corrected markdown index
+    assert at.markdown[1].value == MOCK_VALIDATION_CHECKLIST
 
 def test_validation_checklist_page_warning_if_not_generated():
     """
@@ -203,15 +249,18 @@ def test_navigation_and_monitoring_kpi_designer_page():
     """
     at = AppTest.from_file("app.py").run()
     at.button[0].click().run() # Load data
-    at.button[1].click().run() # Generate playbook components
+    at.button(key="generate_components_button").click().run()
 
     # Navigate to "Monitoring KPI Designer"
-    at.selectbox[0].set_value("Monitoring KPI Designer").run()
+    at.selectbox(key="current_page").set_value("Monitoring KPI Designer").run()
 
     assert at.session_state.current_page == "Monitoring KPI Designer"
     assert "Monitoring KPIs and Incident Triggers" in at.markdown[0].value
-    assert at.json[0].value == MOCK_MONITORING_KPIS
-    assert at.json[1].value == MOCK_INCIDENT_TRIGGERS
+    metrics = {m.label: m.value for m in at.metric}
+    assert metrics["Monitoring KPIs"] == str(len(MOCK_MONITORING_KPIS))
+    assert metrics["Incident Triggers"] == str(len(MOCK_INCIDENT_TRIGGERS))
+    assert at.markdown[2].value == "\n".join(f"- {kpi}" for kpi in MOCK_MONITORING_KPIS)
+    assert at.markdown[4].value == "\n".join(f"- {trigger}" for trigger in MOCK_INCIDENT_TRIGGERS)
 
 def test_monitoring_kpi_page_warning_if_not_generated():
     """
@@ -227,45 +276,68 @@ def test_generate_final_artifacts(mock_external_dependencies):
     """
     at = AppTest.from_file("app.py").run()
     at.button[0].click().run() # Load data
-    at.button[1].click().run() # Generate playbook components
+    at.button(key="generate_components_button").click().run()
 
     # Navigate to "Export Panel"
-    at.selectbox[0].set_value("Export Panel").run()
+    at.selectbox(key="current_page").set_value("Export Panel").run()
 
-    # Click "Generate All Final Artifacts" button (button[0] on this page)
-    at.button[0].click().run()
+    # Click "Generate All Final Artifacts". The ZIP download is deferred, so its file name and
+    # MIME type are registered with the media file manager instead of carried on the widget proto
+    deferred_downloads = {}
+    add_deferred = MediaFileManager.add_deferred
+
+    def _record_deferred(self, data_callable, mimetype, coordinates, file_name=None):
+        file_id = add_deferred(self, data_callable, mimetype, coordinates, file_name=file_name)
+        deferred_downloads[file_id] = {"mime": mimetype, "file_name": file_name, "data": data_callable}
+        return file_id
+
+    with patch.object(MediaFileManager, "add_deferred", _record_deferred):
+        at.button(key="generate_final_artifacts_button").click().run()
 
     assert at.session_state.final_artifacts_generated
     assert at.session_state.config_snapshot == MOCK_CONFIG_SNAPSHOT
     assert at.session_state.executive_summary_content == MOCK_EXECUTIVE_SUMMARY
     assert at.session_state.evidence_manifest == MOCK_EVIDENCE_MANIFEST
-    assert at.success[0].value == "All final artifacts generated successfully!"
+    assert at.success[0].value.startswith("All artifacts generated and saved to 'reports/session13/Session_13_")
+    assert at.success[1].value == "All final artifacts generated successfully!"
+
+    # The already generated components are packaged, and written to disk by default
+    m_package = mock_external_dependencies
+    m_package.assert_called_once()
+    assert m_package.call_args.kwargs["playbook"] == MOCK_PLAYBOOK
+    assert m_package.call_args.kwargs["validation_md"] == MOCK_VALIDATION_CHECKLIST
+    assert m_package.call_args.kwargs["write_files"] is True
 
     # Verify displayed content on the page
-    assert at.json[0].value == MOCK_CONFIG_SNAPSHOT
-    assert at.markdown[13].value == MOCK_EXECUTIVE_SUMMARY # Corrected markdown index for summary
-    assert at.json[1].value == MOCK_EVIDENCE_MANIFEST # Corrected json index for manifest
+    assert MOCK_EXECUTIVE_SUMMARY in [m.value for m in at.markdown]
+    metrics = {m.label: m.value for m in at.metric}
+    assert metrics["Artifacts Tracked"] == str(len(MOCK_EVIDENCE_MANIFEST["artifacts"]))
+    assert metrics["Manifest Timestamp"] == "2025-01-01 00:00:00 UTC"
 
     # Verify download button exists and its properties
     assert at.download_button[0].label == "Download All Artifacts as ZIP"
-    assert at.download_button[0].mime == "application/zip"
-    assert at.download_button[0].file_name.startswith("Session_13_")
-    assert at.download_button[0].file_name.endswith(".zip")
+    download = deferred_downloads[at.download_button[0].proto.deferred_file_id]
+    assert download["mime"] == "application/zip"
+    assert download["file_name"].startswith("Session_13_")
+    assert download["file_name"].endswith(".zip")
+    assert download["file_name"] == at.session_state.output_zip_filename
+    assert download["data"]() == at.session_state.output_zip_buffer.getvalue()
+    assert at.session_state.output_zip_filename.startswith("Session_13_")
+    assert at.session_state.output_zip_filename.endswith(".zip")
     assert isinstance(at.session_state.output_zip_buffer, io.BytesIO)
 
-    # Check that open was called for each file expected to be written
-    m_open = mock_external_dependencies
-    expected_writes = [
+    # The ZIP is built from package_artifacts' result.artifacts; one set check covers every file
+    expected_files = {
         "sector_playbook.json",
         "validation_checklist.md",
         "monitoring_kpis.json",
         "incident_triggers.json",
         "config_snapshot.json",
         "executive_summary.md",
-    ]
-    mock_open_calls = [call.args[0] for call in m_open.call_args_list if call.args[1] == 'w']
-    for filename in expected_writes:
-        assert any(filename in call_path for call_path in mock_open_calls)
+        "evidence_manifest.json",
+    }
+    with zipfile.ZipFile(at.session_state.output_zip_buffer) as zf:
+        assert expected_files.issubset(zf.namelist())
 
 def test_export_panel_page_warning_if_components_not_generated():
     """
@@ -273,21 +345,304 @@ def test_export_panel_page_warning_if_components_not_generated():
     """
     at = AppTest.from_file("app.py").run()
     at.button[0].click().run() # Load data, but don't generate components
-    at.selectbox[0].set_value("Export Panel").run()
+    at.selectbox(key="current_page").set_value("Export Panel").run()
     assert at.warning[0].value == "Please go to 'Sector & Use-Case Wizard' and generate playbook components first."
-    assert at.button[0].disabled is True # "Generate All Final Artifacts" button should be disabled
+    # "Generate All Final Artifacts" is not offered until components exist
+    assert "generate_final_artifacts_button" not in [b.key for b in at.button]
+
+def test_persona_is_pinned_and_shown_in_intro():
+    """
+    Tests that the persona is pinned to the AI Risk Lead on every run and reflected in the
+    "Sector & Use-Case Wizard" intro (the app has no persona selector).
+    """
+    at = AppTest.from_file("app.py").run()
+
+    at.session_state.persona = "Domain AI Lead"
+    at.run()
+
+    assert at.session_state.persona == "AI Risk Lead (Evelyn Reed)"
+    assert "Dr. Evelyn Reed, as the **AI**" in at.markdown[0].value
+
+
+# --- source.py API (real implementations, not the app mocks above) ---
+
+# Captured at import, before the fixtures above patch these names on the source module
+_REAL_SOURCE_FUNCTIONS = {name: getattr(source, name) for name in (
+    "load_sample_use_cases",
+    "load_control_templates",
+    "templates_digest",
+    "generate_playbook_components",
+    "package_artifacts",
+)}
+
+
+@pytest.fixture
+def real_source(tmp_path):
+    """
+    Restores the real source.py functions for tests that exercise source.py directly.
+    Yields a fresh data directory; loader caches are cleared around each test.
+    """
+    with patch.multiple(source, **_REAL_SOURCE_FUNCTIONS):
+        source.clear_caches()
+        yield str(tmp_path / "data")
+        source.clear_caches()
+
+def _load_case(data_dir, use_case_id):
+    use_case = source.select_use_case(use_case_id, source.load_use_case_index(data_dir=data_dir))
+    return use_case, source.load_control_templates(use_case["sector"], data_dir=data_dir)
+
+def test_generate_playbook_components_matches_individual_generators(real_source):
+    """
+    Tests that the single-lookup component builder agrees with the four public generators.
+    """
+    use_case, templates = _load_case(real_source, "FI-LLM-002")
+
+    playbook, validation_md, kpis, triggers = source.generate_playbook_components(use_case, templates)
+
+    assert playbook == source.generate_sector_playbook(
+        use_case["sector"], use_case["system_type"], use_case["risk_tier"], templates)
+    assert validation_md == source.generate_validation_checklist(use_case, templates)
+    assert kpis == source.generate_monitoring_kpis(use_case, templates)
+    assert triggers == source.generate_incident_triggers(use_case, templates)
+    assert playbook["controls"] and kpis and triggers
+
+    # Unknown system type / risk tier yields the same error values as the generators
+    unknown = {**use_case, "risk_tier": "Unknown"}
+    playbook, validation_md, kpis, triggers = source.generate_playbook_components(unknown, templates)
+    assert "error" in playbook
+    assert validation_md == source.generate_validation_checklist(unknown, templates)
+    assert (tuple(kpis), tuple(triggers)) == ((), ())
 
-def test_persona_selection_changes_content():
+def test_package_artifacts_manifest_on_disk_and_in_memory(real_source, tmp_path):
     """
-    Tests that changing the persona updates the displayed text on the "Sector & Use-Case Wizard" page.
+    Tests that package_artifacts hashes every artifact into the manifest and always ships the
+    manifest in `artifacts`, whether or not the files are written to disk.
+    """
+    use_case, templates = _load_case(real_source, "HC-ML-001")
+    playbook, validation_md, kpis, triggers = source.generate_playbook_components(use_case, templates)
+    components = dict(use_case=use_case, playbook=playbook, validation_md=validation_md,
+                      kpis=kpis, triggers=triggers)
+
+    out_dir = tmp_path / "written"
+    written = source.package_artifacts(**components, output_dir=str(out_dir), write_files=True)
+
+    assert set(written.artifacts) == {p.name for p in out_dir.iterdir()}
+    assert "evidence_manifest.json" in written.artifacts
+    for name, payload in written.artifacts.items():
+        assert (out_dir / name).read_bytes() == payload
+    entries = written.evidence_manifest["artifacts"]
+    assert len(entries) == len(written.artifacts) - 1
+    for entry in entries:
+        assert entry["sha256_hash"] == hashlib.sha256((out_dir / entry["filename"]).read_bytes()).hexdigest()
+    assert json.loads(written.artifacts["evidence_manifest.json"]) == written.evidence_manifest
+
+    memory_dir = tmp_path / "memory_only"
+    in_memory = source.package_artifacts(**components, output_dir=str(memory_dir), write_files=False)
+
+    assert not memory_dir.exists()
+    assert set(in_memory.artifacts) == set(written.artifacts)
+    for entry in in_memory.evidence_manifest["artifacts"]:
+        assert entry["sha256_hash"] == hashlib.sha256(in_memory.artifacts[entry["filename"]]).hexdigest()
+        assert entry["filepath"] is None # nothing on disk to point at
+    for entry in entries:
+        assert entry["filepath"] == str(out_dir / entry["filename"])
+    assert json.loads(in_memory.artifacts["evidence_manifest.json"]) == in_memory.evidence_manifest
+
+def test_generate_many_deduplicates_ids_and_validates_first(real_source, tmp_path):
+    """
+    Tests that generate_many runs each id once, in first-seen order, into output_dir/<id>, on a
+    single thread pool, and rejects unknown ids before writing anything.
+    """
+    out_dir = tmp_path / "batch"
+    results = source.generate_many(["FI-LLM-002", "HC-ML-001", "FI-LLM-002"],
+                                   data_dir=real_source, output_dir=str(out_dir))
+
+    assert [r.use_case["id"] for r in results] == ["FI-LLM-002", "HC-ML-001"]
+    assert sorted(p.name for p in out_dir.iterdir()) == ["FI-LLM-002", "HC-ML-001"]
+    for result in results:
+        assert result.output_dir == str(out_dir / result.use_case["id"])
+        assert (out_dir / result.use_case["id"] / "evidence_manifest.json").is_file()
+
+    # One shared pool for the whole batch; cases do not start their own write pools
+    with patch("concurrent.futures.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as m_executor:
+        source.generate_many(["FI-LLM-002", "HC-ML-001", "HC-LLM-003"],
+                             data_dir=real_source, output_dir=str(tmp_path / "pooled"))
+    assert m_executor.call_count == 1
+    assert len(list((tmp_path / "pooled").glob("*/evidence_manifest.json"))) == 3
+
+    rejected_dir = tmp_path / "rejected"
+    with pytest.raises(ValueError, match="NOT-A-CASE"):
+        source.generate_many(["HC-ML-001", "NOT-A-CASE"], data_dir=real_source, output_dir=str(rejected_dir))
+    assert not rejected_dir.exists()
+
+def test_clear_caches_and_template_file_changes(real_source):
+    """
+    Tests that loaders parse each data file once, re-read edited data files, and
+    start over after clear_caches().
+    """
+    templates = source.load_control_templates("Finance", data_dir=real_source)
+    assert source.load_control_templates("Finance", data_dir=real_source) == templates
+    assert source._read_control_templates.cache_info().hits == 1
+    use_cases = source.load_sample_use_cases(data_dir=real_source)
+    assert source.load_sample_use_cases(data_dir=real_source) == use_cases
+    assert source._read_sample_use_cases.cache_info().hits == 1
+
+    source.clear_caches()
+    assert source._read_control_templates.cache_info().currsize == 0
+    assert source.load_control_templates("Finance", data_dir=real_source) == templates
+    assert source.load_sample_use_cases(data_dir=real_source) == use_cases
+
+    path = os.path.join(real_source, "finance_control_templates.json")
+    with open(path, encoding="utf-8") as f:
+        edited = json.load(f)
+    edited["Edited"] = {}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(edited, f)
+    assert "Edited" in source.load_control_templates("Finance", data_dir=real_source)
+
+    # The use-case file follows edits the same way
+    path = os.path.join(real_source, "sample_use_cases.json")
+    with open(path, encoding="utf-8") as f:
+        cases = json.load(f)
+    cases.append({**cases[0], "id": "EDITED-001"})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cases, f)
+    assert source.load_sample_use_cases(data_dir=real_source)[-1]["id"] == "EDITED-001"
+
+def test_loader_results_are_plain_copies(real_source):
+    """
+    Tests that loaders return JSON-native copies: a caller's edits never reach the shared cache.
+    """
+    templates = source.load_control_templates("Finance", data_dir=real_source)
+    assert type(templates) is dict and type(templates["ML"]["High"]["controls"]) is list
+    json.dumps(templates)
+    templates["injected"] = 1
+    templates["ML"]["High"]["controls"].append("injected")
+    reloaded = source.load_control_templates("Finance", data_dir=real_source)
+    assert "injected" not in reloaded
+    assert "injected" not in reloaded["ML"]["High"]["controls"]
+
+    use_cases = source.load_sample_use_cases(data_dir=real_source)
+    assert type(use_cases) is list and type(use_cases[0]) is dict
+    json.dumps(use_cases)
+    use_cases.append({"id": "INJECTED"})
+    use_cases[0]["name"] = "Injected"
+    reloaded = source.load_sample_use_cases(data_dir=real_source)
+    assert len(reloaded) == 5 and reloaded[0]["name"] != "Injected"
+
+    # The orchestration API hands back plain, serializable objects as well
+    result = source.generate_all_artifacts("HC-ML-001", data_dir=real_source, write_files=False)
+    assert type(result.use_case) is dict
+    assert type(result.config_snapshot["use_case_details"]) is dict
+    json.dumps(result.config_snapshot)
+    pickle.dumps(result.config_snapshot)
+    copy.deepcopy(result.use_case)
+
+def test_default_getters_return_copies():
+    """
+    Tests that the built-in defaults (also the data-file seeds) come back as fresh, serializable copies.
+    """
+    use_cases = source.get_default_sample_use_cases()
+    json.dumps(use_cases)
+    json.dumps(source.get_default_healthcare_control_templates())
+    use_cases.append({"id": "INJECTED"})
+    templates = source.get_default_finance_control_templates()
+    templates["injected"] = 1
+    assert len(source.get_default_sample_use_cases()) == 5
+    assert "injected" not in source.get_default_finance_control_templates()
+    assert json.loads(source._default_file_bytes("use_cases")) == source.get_default_sample_use_cases()
+
+def test_templates_digest_tracks_content(real_source):
+    """
+    Tests that templates_digest depends only on template content.
+    """
+    templates = source.load_control_templates("Healthcare", data_dir=real_source)
+    digest = source.templates_digest(templates)
+
+    # 16-byte BLAKE2b over the serialized templates, computed independently here
+    assert digest == hashlib.blake2b(source._dumps_json(templates), digest_size=16).hexdigest()
+    assert len(digest) == 32
+    assert source.templates_digest(copy.deepcopy(templates)) == digest
+    assert source.templates_digest({**templates, "Extra": {}}) != digest
+    assert source.templates_digest(source.load_control_templates("Finance", data_dir=real_source)) != digest
+
+def test_deleted_data_file_is_reseeded(real_source):
+    """
+    Tests that a data file deleted after the directory was first seeded is written again.
+    """
+    templates = source.load_control_templates("Finance", data_dir=real_source)
+    os.remove(os.path.join(real_source, "finance_control_templates.json"))
+
+    assert source.load_control_templates("Finance", data_dir=real_source) == templates
+    assert os.path.isfile(os.path.join(real_source, "finance_control_templates.json"))
+
+def test_select_use_case_sees_in_place_changes(real_source):
+    """
+    Tests that select_use_case reflects the list it is given, even after in-place edits.
+    """
+    cases = [dict(case) for case in source.load_sample_use_cases(data_dir=real_source)]
+    assert source.select_use_case(cases[0]["id"], cases) is cases[0]
+
+    replacement = {**cases[0], "name": "Replaced"}
+    cases[0] = replacement
+    assert source.select_use_case(cases[0]["id"], cases) is replacement
+    assert source.select_use_case("NOT-A-CASE", cases) is None
+
+def test_select_use_case_from_index(real_source):
+    """
+    Tests that select_use_case answers from an id -> case index with the same result as the list scan.
+    """
+    cases = source.load_sample_use_cases(data_dir=real_source)
+    index = source.load_use_case_index(data_dir=real_source)
+    assert list(index) == [case["id"] for case in cases]
+    for case in cases:
+        assert source.select_use_case(case["id"], index) == source.select_use_case(case["id"], cases)
+    assert source.select_use_case("NOT-A-CASE", index) is None
+
+def test_unticked_persist_survives_navigation(mock_external_dependencies):
+    """
+    Tests that unticking "Also save artifacts to disk" survives leaving and re-entering the
+    "Export Panel", so the export stays in memory.
     """
     at = AppTest.from_file("app.py").run()
-    
-    # Change persona using the sidebar selectbox (selectbox[1])
-    at.selectbox[1].set_value("Domain AI Lead").run()
-
-    assert at.session_state.persona == "Domain AI Lead"
-    # Verify that the displayed text reflecting the persona has changed
-    assert "Domain" in at.markdown[1].value # Check for 'Domain' in the paragraph describing Evelyn Reed's role
-    assert "Evelyn Reed" not in at.markdown[1].value # The initial specific name part of the sentence
-    assert "Domain AI Lead" in at.markdown[1].value # The full persona string will also be mentioned
+    at.button[0].click().run() # Load data
+    at.button(key="generate_components_button").click().run()
+    at.selectbox(key="current_page").set_value("Export Panel").run()
+
+    at.checkbox(key="persist_artifacts_checkbox").uncheck().run()
+    at.selectbox(key="current_page").set_value("Monitoring KPI Designer").run()
+    at.selectbox(key="current_page").set_value("Export Panel").run()
+
+    assert at.session_state.persist_artifacts is False
+    assert at.checkbox(key="persist_artifacts_checkbox").value is False
+
+    at.button(key="generate_final_artifacts_button").click().run()
+
+    assert mock_external_dependencies.call_args.kwargs["write_files"] is False
+    assert at.session_state.output_dir_path is None
+    assert at.checkbox(key="persist_artifacts_checkbox").value is False
+
+def test_in_memory_manifest_hides_path_column():
+    """
+    Tests that the evidence manifest table only shows a "Path" column when artifacts were saved.
+    """
+    in_memory_manifest = {
+        "manifest_timestamp": MOCK_EVIDENCE_MANIFEST["manifest_timestamp"],
+        "artifacts": [{**entry, "filepath": None} for entry in MOCK_EVIDENCE_MANIFEST["artifacts"]],
+    }
+    at = AppTest.from_file("app.py").run()
+    at.button[0].click().run() # Load data
+    at.button(key="generate_components_button").click().run()
+    # Patched before the run that defines the export callback, which binds package_artifacts
+    with patch("source.package_artifacts", side_effect=lambda **kwargs: dataclasses.replace(
+            _mock_package_artifacts(**kwargs), evidence_manifest=in_memory_manifest)):
+        at.selectbox(key="current_page").set_value("Export Panel").run()
+        at.button(key="generate_final_artifacts_button").click().run()
+
+    assert "Path" not in at.dataframe[-1].value.columns
+    assert list(at.dataframe[-1].value["Filename"]) == [e["filename"] for e in in_memory_manifest["artifacts"]]
+
+    # With saved artifacts the paths are listed
+    at.session_state.evidence_manifest = MOCK_EVIDENCE_MANIFEST
+    at.run()
+    assert list(at.dataframe[-1].value["Path"]) == [e["filepath"] for e in MOCK_EVIDENCE_MANIFEST["artifacts"]]